@@ -1,55 +1,183 @@
-from collections import defaultdict, deque
+"""
+Lab 4: Graph Algorithms
+Completeness, connectivity, bipartiteness, A* shortest paths and minimum spanning trees
+
+Usage:
+    python lab4_graph_alg.py                       # demonstration
+    python lab4_graph_alg.py bench --graph grid --vertices 100000
+"""
+
+from array import array
+from collections import OrderedDict, defaultdict, deque
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+import argparse
 import heapq
+import json
+import math
+import mmap
+import random
+import statistics
+import struct
+import sys
+import time
+import tracemalloc
+
+# Binary file layouts: 8-byte magic + two uint64 counts, then 8-byte aligned arrays
+_CSR_MAGIC = b'CSRGRAPH'
+_EDGES_MAGIC = b'EDGELIST'
+_CSR_HEADER = struct.Struct('<8sQQ')
+
+class DisjointSet:
+    """Union-find with path compression and union by rank"""
+    
+    def __init__(self, size):
+        self.parent = list(range(size))
+        self.rank = [0] * size
+        self.count = size  # number of disjoint sets
+    
+    def find(self, x):
+        """Find the set representative of x. Amortized O(α(n))"""
+        parent = self.parent
+        root = x
+        while parent[root] != root:
+            root = parent[root]
+        while parent[x] != root:
+            parent[x], x = root, parent[x]
+        return root
+    
+    def union(self, x, y):
+        """Merge the sets of x and y; returns False if already in the same set"""
+        root_x, root_y = self.find(x), self.find(y)
+        if root_x == root_y:
+            return False
+        if self.rank[root_x] < self.rank[root_y]:
+            root_x, root_y = root_y, root_x
+        self.parent[root_y] = root_x
+        if self.rank[root_x] == self.rank[root_y]:
+            self.rank[root_x] += 1
+        self.count -= 1
+        return True
+    
+    def connected(self, x, y):
+        return self.find(x) == self.find(y)
 
 class Graph:
-    def __init__(self, vertices):
+    def __init__(self, vertices, dense=True):
         self.V = vertices
         self.adj_list = defaultdict(list)
-        self.adj_matrix = [[0] * vertices for _ in range(vertices)]
+        # The V x V matrix is only affordable for small graphs; pass
+        # dense=False for large sparse graphs (e.g. million-vertex grids)
+        self.adj_matrix = [[0] * vertices for _ in range(vertices)] if dense else None
+        self.coords = {}
+        # Bumped on every mutation so caches built on top can detect staleness
+        self.version = 0
+        # Maintained incrementally so connectivity queries never re-traverse
+        self.components = DisjointSet(vertices)
+        # Optional IncrementalMST kept current by add_edge (see track_mst)
+        self.mst = None
+        # (min(u, v), max(u, v)) -> weight; one entry per undirected edge
+        self.edge_index = {}
+    
+    @staticmethod
+    def _edge_key(u, v):
+        return (u, v) if u <= v else (v, u)
+    
+    @property
+    def edge_count(self):
+        """Number of distinct edges. Time: O(1)"""
+        return len(self.edge_index)
+    
+    def has_edge(self, u, v):
+        """Check whether u and v are adjacent. Time: O(1)"""
+        return self._edge_key(u, v) in self.edge_index
     
     def add_edge(self, u, v, weight=1):
-        """Add an undirected edge to the graph"""
-        self.adj_list[u].append((v, weight))
-        self.adj_list[v].append((u, weight))
-        self.adj_matrix[u][v] = weight
-        self.adj_matrix[v][u] = weight
+        """
+        Add an undirected edge to the graph.
+        Re-adding an existing edge updates its weight instead of creating
+        a parallel edge.
+        """
+        key = self._edge_key(u, v)
+        old_weight = self.edge_index.get(key)
+        if old_weight is None:
+            self.adj_list[u].append((v, weight))
+            self.adj_list[v].append((u, weight))
+            self.components.union(u, v)
+        elif old_weight == weight:
+            return
+        else:
+            self._replace_weight(u, v, weight)
+            if u != v:
+                self._replace_weight(v, u, weight)
+        self.edge_index[key] = weight
+        if self.adj_matrix is not None:
+            self.adj_matrix[u][v] = weight
+            self.adj_matrix[v][u] = weight
+        self.version += 1
+        if self.mst is not None and u != v:
+            if old_weight is None or weight < old_weight:
+                self.mst.insert_edge(u, v, weight)
+            elif self.mst.has_edge(u, v):
+                # A heavier tree edge may need a replacement from outside the
+                # tree, which insert-only maintenance cannot find: rebuild
+                self.mst.rebuild(self)
+    
+    def track_mst(self):
+        """Start maintaining the MST incrementally on every add_edge; returns it"""
+        self.mst = IncrementalMST.from_graph(self)
+        return self.mst
+    
+    def set_position(self, vertex, x, y):
+        """Attach 2D coordinates to a vertex (used by A* heuristics)"""
+        self.coords[vertex] = (x, y)
+    
+    def _replace_weight(self, u, v, weight):
+        neighbors = self.adj_list[u]
+        for i, (neighbor, _) in enumerate(neighbors):
+            if neighbor == v:
+                neighbors[i] = (v, weight)
     
     def get_edges(self):
-        """Get all unique edges"""
-        edges = []
-        seen = set()
-        for u in range(self.V):
-            for v, weight in self.adj_list[u]:
-                edge_key = tuple(sorted([u, v]))
-                if edge_key not in seen:
-                    edges.append((u, v, weight))
-                    seen.add(edge_key)
-        return edges
+        """Lazily iterate over all unique edges as (u, v, weight) with u <= v"""
+        return ((u, v, weight) for (u, v), weight in self.edge_index.items())
 
 def check_completeness(graph):
     """Check if graph is complete (every vertex connected to every other)"""
     expected_edges = (graph.V * (graph.V - 1)) // 2
-    actual_edges = len(graph.get_edges())
-    return actual_edges == expected_edges
+    if graph.edge_count != expected_edges:
+        return False
+    # Right count but a self-loop could stand in for a missing edge
+    return all(len(graph.adj_list[u]) == graph.V - 1 for u in range(graph.V))
 
 def check_connectivity_dfs(graph):
     """Check if graph is connected using DFS"""
     if graph.V == 0:
         return True
     
-    visited = set()
+    visited = bytearray(graph.V)
+    visited_count = 0
     stack = [0]
     
     while stack:
         vertex = stack.pop()
-        if vertex in visited:
+        if visited[vertex]:
             continue
-        visited.add(vertex)
+        visited[vertex] = 1
+        visited_count += 1
         for neighbor, _ in graph.adj_list[vertex]:
-            if neighbor not in visited:
+            if not visited[neighbor]:
                 stack.append(neighbor)
     
-    return len(visited) == graph.V
+    return visited_count == graph.V
+
+def check_connectivity(graph):
+    """Check if graph is connected using the incrementally maintained union-find. Time: O(1)"""
+    return graph.components.count <= 1
+
+def count_components(graph):
+    """Number of connected components. Time: O(1)"""
+    return graph.components.count
 
 def check_bipartiteness(graph):
     """Check if graph is bipartite using two-coloring (BFS)"""
@@ -73,49 +201,152 @@ def check_bipartiteness(graph):
     
     return True, coloring
 
-def a_star_shortest_path(graph, start, goal):
-    """Find shortest path using A* algorithm"""
-    def heuristic(vertex):
-        # Simple heuristic (makes it equivalent to Dijkstra's)
-        return 0
+def euclidean_heuristic(graph):
+    """
+    Straight-line distance between vertex coordinates.
+    Admissible when every edge weight is at least the Euclidean
+    distance between its endpoints.
+    """
+    coords = graph.coords
+    
+    def heuristic(u, v):
+        (x1, y1), (x2, y2) = coords[u], coords[v]
+        return math.hypot(x1 - x2, y1 - y2)
+    
+    return heuristic
+
+def manhattan_heuristic(graph):
+    """
+    Manhattan distance between vertex coordinates.
+    Admissible on 4-connected grids whose edge weights are at least
+    the coordinate step between neighbours.
+    """
+    coords = graph.coords
+    
+    def heuristic(u, v):
+        (x1, y1), (x2, y2) = coords[u], coords[v]
+        return abs(x1 - x2) + abs(y1 - y2)
+    
+    return heuristic
+
+def _reconstruct_path(came_from, start, goal):
+    path = [goal]
+    while path[-1] != start:
+        path.append(came_from[path[-1]])
+    path.reverse()
+    return path
+
+def a_star_shortest_path(graph, start, goal, heuristic=None, bidirectional=False):
+    """
+    Find shortest path using A* algorithm
+    
+    heuristic(u, v) must be an admissible, consistent estimate of the
+    distance between u and v (see euclidean_heuristic / manhattan_heuristic).
+    Without one the search is equivalent to Dijkstra's.
     
-    open_set = {start}
+    The open set is a binary heap with lazy deletion: stale entries are
+    skipped on pop instead of being removed, so each pop is O(log V).
+    Scores live in sparse dicts that only hold touched vertices, and the
+    search stops as soon as the goal is settled.
+    """
+    if start == goal:
+        return [start], 0
+    if bidirectional:
+        return _bidirectional_a_star(graph, start, goal, heuristic)
+    
+    adj_list = graph.adj_list
     came_from = {}
-    g_score = {i: float('inf') for i in range(graph.V)}
-    g_score[start] = 0
-    f_score = {i: float('inf') for i in range(graph.V)}
-    f_score[start] = heuristic(start)
+    g_score = {start: 0}
+    closed = set()
+    h = (lambda vertex: heuristic(vertex, goal)) if heuristic else (lambda vertex: 0)
+    # Ties on f are broken towards larger g (deeper vertices), which keeps
+    # A* from fanning out across plateaus of equal f such as grid graphs
+    open_heap = [(h(start), 0, start)]
     
-    while open_set:
-        # Find vertex with lowest f_score
-        current = min(open_set, key=lambda v: f_score[v])
+    while open_heap:
+        _, neg_g, current = heapq.heappop(open_heap)
+        if current in closed:
+            continue  # stale heap entry
         
         if current == goal:
-            # Reconstruct path
-            path = []
-            while current in came_from:
-                path.append(current)
-                current = came_from[current]
-            path.append(start)
-            path.reverse()
-            return path, g_score[goal]
-        
-        open_set.remove(current)
-        
-        for neighbor, weight in graph.adj_list[current]:
-            tentative_g_score = g_score[current] + weight
+            return _reconstruct_path(came_from, start, goal), -neg_g
+        
+        closed.add(current)
+        
+        for neighbor, weight in adj_list[current]:
+            if neighbor in closed:
+                continue
+            tentative_g_score = weight - neg_g
             
-            if tentative_g_score < g_score[neighbor]:
+            if tentative_g_score < g_score.get(neighbor, math.inf):
                 came_from[neighbor] = current
                 g_score[neighbor] = tentative_g_score
-                f_score[neighbor] = tentative_g_score + heuristic(neighbor)
-                open_set.add(neighbor)
+                heapq.heappush(open_heap, (tentative_g_score + h(neighbor), -tentative_g_score, neighbor))
     
     return [], float('inf')
 
+def _bidirectional_a_star(graph, start, goal, heuristic):
+    """
+    Bidirectional A* with average potentials: the forward search uses
+    p(v) = (h(v, goal) - h(v, start)) / 2 and the backward search -p(v),
+    which keeps both consistent so the usual bidirectional Dijkstra
+    stopping rule (top_f + top_b >= best) stays exact.
+    """
+    adj_list = graph.adj_list
+    if heuristic:
+        def potential(vertex):
+            return (heuristic(vertex, goal) - heuristic(vertex, start)) / 2
+    else:
+        def potential(vertex):
+            return 0
+    
+    # index 0 = forward from start, index 1 = backward from goal
+    g_scores = ({start: 0}, {goal: 0})
+    parents = ({}, {})
+    closed = (set(), set())
+    signs = (1, -1)
+    heaps = ([(potential(start), 0, start)], [(-potential(goal), 0, goal)])
+    best_cost = math.inf
+    meeting = None
+    
+    while heaps[0] and heaps[1]:
+        if heaps[0][0][0] + heaps[1][0][0] >= best_cost:
+            break
+        side = 0 if len(heaps[0]) <= len(heaps[1]) else 1
+        heap, g_score, parent, done = heaps[side], g_scores[side], parents[side], closed[side]
+        other_g = g_scores[1 - side]
+        sign = signs[side]
+        
+        _, neg_g, current = heapq.heappop(heap)
+        if current in done:
+            continue
+        done.add(current)
+        
+        for neighbor, weight in adj_list[current]:
+            if neighbor in done:
+                continue
+            tentative_g_score = weight - neg_g
+            if tentative_g_score < g_score.get(neighbor, math.inf):
+                parent[neighbor] = current
+                g_score[neighbor] = tentative_g_score
+                heapq.heappush(heap, (tentative_g_score + sign * potential(neighbor), -tentative_g_score, neighbor))
+                if neighbor in other_g and tentative_g_score + other_g[neighbor] < best_cost:
+                    best_cost = tentative_g_score + other_g[neighbor]
+                    meeting = neighbor
+    
+    if meeting is None:
+        return [], float('inf')
+    
+    path = _reconstruct_path(parents[0], start, meeting)
+    vertex = meeting
+    while vertex != goal:
+        vertex = parents[1][vertex]
+        path.append(vertex)
+    return path, best_cost
+
 def prims_mst(graph):
     """Find Minimum Spanning Tree using Prim's algorithm"""
-    if not check_connectivity_dfs(graph):
+    if not check_connectivity(graph):
         return [], 0
     
     mst_edges = []
@@ -143,108 +374,1078 @@ def prims_mst(graph):
     total_weight = sum(w for _, _, w in mst_edges)
     return mst_edges, total_weight
 
-# Example usage
-print("=" * 60)
-print("LAB 4: GRAPH ALGORITHMS DEMONSTRATION")
-print("=" * 60)
-
-# Create a sample graph
-g = Graph(6)
-g.add_edge(0, 1, 4)
-g.add_edge(0, 2, 3)
-g.add_edge(1, 2, 1)
-g.add_edge(1, 3, 2)
-g.add_edge(2, 3, 4)
-g.add_edge(3, 4, 2)
-g.add_edge(4, 5, 6)
-
-print("\nGraph Structure:")
-print(f"Vertices: {g.V}")
-print(f"Edges: {g.get_edges()}")
-
-print("\n" + "=" * 60)
-print("GRAPH PROPERTIES")
-print("=" * 60)
-
-# Check completeness
-is_complete = check_completeness(g)
-print(f"\n1. Completeness: {'✓ Complete' if is_complete else '✗ Not Complete'}")
-print(f"   Expected edges for complete graph: {(g.V * (g.V - 1)) // 2}")
-print(f"   Actual edges: {len(g.get_edges())}")
-
-# Check connectivity
-is_connected = check_connectivity_dfs(g)
-print(f"\n2. Connectivity: {'✓ Connected' if is_connected else '✗ Not Connected'}")
-
-# Check bipartiteness
-is_bipartite, coloring = check_bipartiteness(g)
-print(f"\n3. Bipartiteness: {'✓ Bipartite' if is_bipartite else '✗ Not Bipartite'}")
-if is_bipartite:
-    set_a = [i for i, c in enumerate(coloring) if c == 0]
-    set_b = [i for i, c in enumerate(coloring) if c == 1]
-    print(f"   Set A: {set_a}")
-    print(f"   Set B: {set_b}")
-
-print("\n" + "=" * 60)
-print("SHORTEST PATH (A* ALGORITHM)")
-print("=" * 60)
-
-start, goal = 0, 5
-path, cost = a_star_shortest_path(g, start, goal)
-print(f"\nFinding shortest path from vertex {start} to vertex {goal}")
-if path:
-    print(f"Path: {' → '.join(map(str, path))}")
-    print(f"Total cost: {cost}")
-else:
-    print("No path exists")
-
-print("\n" + "=" * 60)
-print("MINIMUM SPANNING TREE (PRIM'S ALGORITHM)")
-print("=" * 60)
-
-mst_edges, total_weight = prims_mst(g)
-print(f"\nMST Edges:")
-for u, v, weight in mst_edges:
-    print(f"  {u} ↔ {v} (weight: {weight})")
-print(f"\nTotal MST weight: {total_weight}")
-
-print("\n" + "=" * 60)
-print("TESTING WITH DIFFERENT GRAPH TYPES")
-print("=" * 60)
-
-# Test with a complete graph
-print("\n1. Complete Graph (K4):")
-complete_g = Graph(4)
-for i in range(4):
-    for j in range(i + 1, 4):
-        complete_g.add_edge(i, j, 1)
-print(f"   Complete: {check_completeness(complete_g)}")
-print(f"   Connected: {check_connectivity_dfs(complete_g)}")
-print(f"   Bipartite: {check_bipartiteness(complete_g)[0]}")
-
-# Test with a bipartite graph
-print("\n2. Bipartite Graph:")
-bipartite_g = Graph(4)
-bipartite_g.add_edge(0, 2, 1)
-bipartite_g.add_edge(0, 3, 1)
-bipartite_g.add_edge(1, 2, 1)
-bipartite_g.add_edge(1, 3, 1)
-print(f"   Complete: {check_completeness(bipartite_g)}")
-print(f"   Connected: {check_connectivity_dfs(bipartite_g)}")
-is_bip, col = check_bipartiteness(bipartite_g)
-print(f"   Bipartite: {is_bip}")
-if is_bip:
-    print(f"   Coloring: {col}")
-
-# Test with a disconnected graph
-print("\n3. Disconnected Graph:")
-disconnected_g = Graph(5)
-disconnected_g.add_edge(0, 1, 1)
-disconnected_g.add_edge(2, 3, 1)
-print(f"   Complete: {check_completeness(disconnected_g)}")
-print(f"   Connected: {check_connectivity_dfs(disconnected_g)}")
-print(f"   Bipartite: {check_bipartiteness(disconnected_g)[0]}")
-
-print("\n" + "=" * 60)
-print("DEMONSTRATION COMPLETE")
-print("=" * 60)
+def kruskal_mst(graph):
+    """
+    Find Minimum Spanning Tree using Kruskal's algorithm.
+    Unlike prims_mst, a disconnected graph yields a minimum spanning
+    forest (one tree per component) instead of an empty result.
+    Time Complexity: O(E log E)
+    """
+    forest = DisjointSet(graph.V)
+    mst_edges = []
+    
+    edges = sorted((weight, u, v) for u, v, weight in graph.get_edges() if u != v)
+    
+    for weight, u, v in edges:
+        if forest.union(u, v):
+            mst_edges.append((u, v, weight))
+            if forest.count == 1:
+                break
+    
+    total_weight = sum(w for _, _, w in mst_edges)
+    return mst_edges, total_weight
+
+class LinkCutTree:
+    """
+    Sleator–Tarjan link-cut tree over a dynamic forest, with path-maximum
+    queries. Every node carries a weight; path_max(x, y) returns the node
+    of largest weight on the tree path x..y. All operations are amortized
+    O(log n). Nodes are integer indices into parallel lists.
+    """
+    
+    def __init__(self, size=0):
+        self.left = []
+        self.right = []
+        self.parent = []
+        self.flip = []
+        self.weight = []
+        self.best = []  # node of maximum weight in the splay subtree
+        for _ in range(size):
+            self.add_node()
+    
+    def add_node(self, weight=-math.inf):
+        node = len(self.weight)
+        self.left.append(-1)
+        self.right.append(-1)
+        self.parent.append(-1)
+        self.flip.append(False)
+        self.weight.append(weight)
+        self.best.append(node)
+        return node
+    
+    def _is_splay_root(self, x):
+        p = self.parent[x]
+        return p == -1 or (self.left[p] != x and self.right[p] != x)
+    
+    def _push(self, x):
+        if self.flip[x]:
+            left, right = self.left, self.right
+            left[x], right[x] = right[x], left[x]
+            for child in (left[x], right[x]):
+                if child != -1:
+                    self.flip[child] = not self.flip[child]
+            self.flip[x] = False
+    
+    def _pull(self, x):
+        weight, best = self.weight, self.best
+        top = x
+        for child in (self.left[x], self.right[x]):
+            if child != -1 and weight[best[child]] > weight[top]:
+                top = best[child]
+        best[x] = top
+    
+    def _rotate(self, x):
+        left, right, parent = self.left, self.right, self.parent
+        p = parent[x]
+        g = parent[p]
+        if not self._is_splay_root(p):
+            if left[g] == p:
+                left[g] = x
+            else:
+                right[g] = x
+        parent[x] = g
+        if left[p] == x:
+            left[p] = right[x]
+            if right[x] != -1:
+                parent[right[x]] = p
+            right[x] = p
+        else:
+            right[p] = left[x]
+            if left[x] != -1:
+                parent[left[x]] = p
+            left[x] = p
+        parent[p] = x
+        self._pull(p)
+        self._pull(x)
+    
+    def _splay(self, x):
+        path = [x]
+        while not self._is_splay_root(path[-1]):
+            path.append(self.parent[path[-1]])
+        for node in reversed(path):
+            self._push(node)
+        
+        while not self._is_splay_root(x):
+            p = self.parent[x]
+            if not self._is_splay_root(p):
+                g = self.parent[p]
+                zig_zig = (self.left[g] == p) == (self.left[p] == x)
+                self._rotate(p if zig_zig else x)
+            self._rotate(x)
+    
+    def _access(self, x):
+        last = -1
+        node = x
+        while node != -1:
+            self._splay(node)
+            self.right[node] = last
+            self._pull(node)
+            last = node
+            node = self.parent[node]
+        self._splay(x)
+    
+    def _make_root(self, x):
+        self._access(x)
+        self.flip[x] = not self.flip[x]
+    
+    def find_root(self, x):
+        self._access(x)
+        while True:
+            self._push(x)
+            if self.left[x] == -1:
+                break
+            x = self.left[x]
+        self._splay(x)
+        return x
+    
+    def connected(self, x, y):
+        return x == y or self.find_root(x) == self.find_root(y)
+    
+    def link(self, x, y):
+        """Add tree edge x - y; x and y must be in different trees"""
+        self._make_root(x)
+        self.parent[x] = y
+    
+    def cut(self, x, y):
+        """Remove tree edge x - y"""
+        self._make_root(x)
+        self._access(y)
+        # x is now y's left child with nothing between them
+        self.left[y] = -1
+        self.parent[x] = -1
+        self._pull(y)
+    
+    def path_max(self, x, y):
+        """Node of maximum weight on the path x..y (same tree required)"""
+        self._make_root(x)
+        self._access(y)
+        return self.best[y]
+
+class IncrementalMST:
+    """
+    Minimum spanning forest maintained under edge insertions.
+    
+    Each tree edge is an extra link-cut tree node (weighted) spliced
+    between its endpoints, so path_max finds the heaviest edge on the
+    cycle a new edge would close. If the new edge is lighter, that edge is
+    cut and the new one linked (the cycle property). Each insertion costs
+    amortized O(log V); the current edges and total weight are kept
+    up to date and read in O(1).
+    """
+    
+    def __init__(self, vertices):
+        self.V = vertices
+        self.tree = LinkCutTree(vertices)
+        self.total_weight = 0
+        self.edges = {}  # (min(u, v), max(u, v)) -> weight, tree edges only
+        self._edge_keys = {}  # link-cut node -> edge key
+        self._free_nodes = []
+    
+    @classmethod
+    def from_graph(cls, graph):
+        mst = cls(graph.V)
+        mst.rebuild(graph)
+        return mst
+    
+    def rebuild(self, graph):
+        """Recompute from scratch in place, from all edges of graph"""
+        self.__init__(graph.V)
+        for u, v, weight in graph.get_edges():
+            self.insert_edge(u, v, weight)
+    
+    @property
+    def mst_edges(self):
+        """Live view of the tree edges as ((u, v), weight) pairs"""
+        return self.edges.items()
+    
+    def has_edge(self, u, v):
+        return Graph._edge_key(u, v) in self.edges
+    
+    def insert_edge(self, u, v, weight):
+        """Offer a new edge; returns True if the spanning forest changed"""
+        if u == v:
+            return False
+        tree = self.tree
+        if tree.connected(u, v):
+            heaviest = tree.path_max(u, v)
+            if tree.weight[heaviest] <= weight:
+                return False
+            self._remove(heaviest)
+        self._add(u, v, weight)
+        return True
+    
+    def _add(self, u, v, weight):
+        tree = self.tree
+        if self._free_nodes:
+            node = self._free_nodes.pop()
+            tree.weight[node] = weight
+            tree.best[node] = node
+        else:
+            node = tree.add_node(weight)
+        tree.link(node, u)
+        tree.link(v, node)
+        key = Graph._edge_key(u, v)
+        self.edges[key] = weight
+        self._edge_keys[node] = key
+        self.total_weight += weight
+    
+    def _remove(self, node):
+        tree = self.tree
+        key = self._edge_keys.pop(node)
+        u, v = key
+        tree.cut(u, node)
+        tree.cut(node, v)
+        del self.edges[key]
+        self.total_weight -= tree.weight[node]
+        self._free_nodes.append(node)
+
+def dijkstra_distances(graph, source):
+    """Single-source shortest distances as a list indexed by vertex (inf if unreachable)"""
+    dist = [math.inf] * graph.V
+    dist[source] = 0
+    adj_list = graph.adj_list
+    heap = [(0, source)]
+    
+    while heap:
+        d, vertex = heapq.heappop(heap)
+        if d > dist[vertex]:
+            continue  # stale heap entry
+        for neighbor, weight in adj_list[vertex]:
+            nd = d + weight
+            if nd < dist[neighbor]:
+                dist[neighbor] = nd
+                heapq.heappush(heap, (nd, neighbor))
+    
+    return dist
+
+class ShortestPathIndex:
+    """
+    Repeated shortest-path queries on a (mostly) static graph.
+    
+    Preprocessing splits the landmarks over the connected components,
+    picks them by farthest-point selection and stores a distance table
+    per landmark. By the triangle inequality
+    |d(L, u) - d(L, v)| <= d(u, v) for every landmark L, so the maximum
+    over landmarks is an admissible, consistent A* heuristic (ALT).
+    
+    Queries between different components are answered from the graph's
+    union-find without searching.
+    
+    Recent (start, goal) answers are kept in an LRU cache. Both the cache
+    and the landmark tables are dropped when graph.version changes, i.e.
+    after any add_edge.
+    """
+    
+    def __init__(self, graph, num_landmarks=8, cache_size=1024, bidirectional=True):
+        self.graph = graph
+        self.num_landmarks = num_landmarks
+        self.cache_size = cache_size
+        self.bidirectional = bidirectional
+        self.landmarks = []
+        self.tables = []
+        self.cache = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._version = None
+    
+    def preprocess(self):
+        """Select landmarks and compute their distance tables. Time: O(k (E + V) log V)"""
+        graph = self.graph
+        self.landmarks = []
+        self.tables = []
+        self.cache.clear()
+        self._version = graph.version
+        if graph.V == 0:
+            return
+        
+        # Split the landmark budget over the non-trivial components: the
+        # largest ones get one each, extra landmarks go by size (D'Hondt)
+        members = defaultdict(list)
+        for vertex in range(graph.V):
+            members[graph.components.find(vertex)].append(vertex)
+        components = sorted((group for group in members.values() if len(group) > 1), key=len, reverse=True)
+        components = components[:self.num_landmarks]
+        quota = [1] * len(components)
+        for _ in range(self.num_landmarks - len(components)):
+            best = max(range(len(components)), key=lambda i: len(components[i]) / (quota[i] + 1), default=None)
+            if best is None:
+                break
+            quota[best] += 1
+        
+        # Farthest-point selection inside each component: each new landmark
+        # is the member farthest from the component's landmarks so far
+        closest = [math.inf] * graph.V
+        for group, count in zip(components, quota):
+            candidate = group[0]
+            for _ in range(min(count, len(group))):
+                table = dijkstra_distances(graph, candidate)
+                self.landmarks.append(candidate)
+                self.tables.append(table)
+                for vertex in group:
+                    if table[vertex] < closest[vertex]:
+                        closest[vertex] = table[vertex]
+                candidate = max(group, key=closest.__getitem__)
+                if closest[candidate] == 0:
+                    break  # every member is already a landmark
+    
+    def heuristic(self, u, v):
+        """ALT lower bound: max over landmarks of |d(L, u) - d(L, v)|"""
+        best = 0
+        for table in self.tables:
+            du, dv = table[u], table[v]
+            if du == math.inf or dv == math.inf:
+                if du != dv:
+                    return math.inf  # different components: v is unreachable
+                continue
+            diff = du - dv if du > dv else dv - du
+            if diff > best:
+                best = diff
+        return best
+    
+    def shortest_path(self, start, goal):
+        """
+        Cached ALT A* query returning (path, cost) like a_star_shortest_path.
+        The cache keeps the path as a tuple and every call returns a fresh
+        list, so callers may modify it freely.
+        """
+        if self._version != self.graph.version:
+            self.preprocess()
+        
+        key = (start, goal)
+        cached = self.cache.get(key)
+        if cached is not None:
+            self.hits += 1
+            self.cache.move_to_end(key)
+            path, cost = cached
+            return list(path), cost
+        
+        self.misses += 1
+        if not self.graph.components.connected(start, goal) or self.heuristic(start, goal) == math.inf:
+            path, cost = [], float('inf')
+        else:
+            path, cost = a_star_shortest_path(self.graph, start, goal, self.heuristic, self.bidirectional)
+        self.cache[key] = (tuple(path), cost)
+        if len(self.cache) > self.cache_size:
+            self.cache.popitem(last=False)
+        return path, cost
+
+class CSRGraph:
+    """
+    Compressed sparse row snapshot of a Graph for bulk analytics.
+    Neighbours of v are targets[offsets[v]:offsets[v + 1]] with matching
+    weights; all three are flat typed arrays instead of per-vertex lists.
+    """
+    
+    def __init__(self, vertices, offsets, targets, weights):
+        self.V = vertices
+        self.offsets = offsets
+        self.targets = targets
+        self.weights = weights
+    
+    @classmethod
+    def from_graph(cls, graph):
+        offsets = array('q', [0])
+        targets = array('q')
+        weights = array('d')
+        for vertex in range(graph.V):
+            for neighbor, weight in graph.adj_list.get(vertex, ()):
+                targets.append(neighbor)
+                weights.append(weight)
+            offsets.append(len(targets))
+        return cls(graph.V, offsets, targets, weights)
+    
+    @classmethod
+    def from_edge_arrays(cls, vertices, sources, destinations, weights):
+        """
+        Build an undirected CSR straight from parallel edge arrays with a
+        counting sort: one pass for degrees, a prefix sum, one pass to
+        scatter. No per-edge add_edge, dicts or matrix writes.
+        """
+        offsets = array('q', [0]) * (vertices + 1)
+        for u, v in zip(sources, destinations):
+            offsets[u + 1] += 1
+            offsets[v + 1] += 1
+        for vertex in range(vertices):
+            offsets[vertex + 1] += offsets[vertex]
+        
+        cursor = array('q', offsets[:vertices])
+        targets = array('q', [0]) * offsets[vertices]
+        csr_weights = array('d', [0.0]) * offsets[vertices]
+        for u, v, weight in zip(sources, destinations, weights):
+            targets[cursor[u]] = v
+            csr_weights[cursor[u]] = weight
+            cursor[u] += 1
+            targets[cursor[v]] = u
+            csr_weights[cursor[v]] = weight
+            cursor[v] += 1
+        return cls(vertices, offsets, targets, csr_weights)
+    
+    def save(self, path):
+        """Persist as header + raw offsets/targets/weights, ready for load()"""
+        with open(path, 'wb') as f:
+            f.write(_CSR_HEADER.pack(_CSR_MAGIC, self.V, len(self.targets)))
+            for data in (self.offsets, self.targets, self.weights):
+                f.write(memoryview(data).cast('B'))
+    
+    @classmethod
+    def load(cls, path):
+        """
+        Memory-map a file written by save(). Nothing is parsed or copied:
+        the arrays are read-only views into the page cache, so reopening is
+        O(1) and concurrent processes share the same physical pages.
+        """
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, vertices, entries = _CSR_HEADER.unpack_from(mapped)
+        if magic != _CSR_MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a CSR graph file")
+        
+        view = memoryview(mapped)
+        start = _CSR_HEADER.size
+        sections = []
+        for count, fmt in ((vertices + 1, 'q'), (entries, 'q'), (entries, 'd')):
+            sections.append(view[start:start + 8 * count].cast(fmt))
+            start += 8 * count
+        csr = cls(vertices, *sections)
+        csr.mapped = mapped  # keep the mapping alive as long as the views
+        return csr
+
+def read_edge_list(path):
+    """
+    Read an edge list file, text or binary (detected by magic header).
+    Text lines are "u v [weight]"; blank lines and '#' comments are skipped.
+    Returns (vertices, sources, destinations, weights) as typed arrays,
+    with vertices = highest vertex id + 1.
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(_EDGES_MAGIC)) == _EDGES_MAGIC:
+            f.seek(0)
+            return _read_binary_edge_list(f)
+    
+    sources, destinations, weights = array('q'), array('q'), array('d')
+    with open(path) as f:
+        for line in f:
+            fields = line.split('#', 1)[0].split()
+            if not fields:
+                continue
+            sources.append(int(fields[0]))
+            destinations.append(int(fields[1]))
+            weights.append(float(fields[2]) if len(fields) > 2 else 1.0)
+    vertices = max(max(sources, default=-1), max(destinations, default=-1)) + 1
+    return vertices, sources, destinations, weights
+
+def _read_binary_edge_list(f):
+    _, vertices, edges = _CSR_HEADER.unpack(f.read(_CSR_HEADER.size))
+    sections = []
+    for fmt in ('q', 'q', 'd'):
+        data = array(fmt)
+        data.fromfile(f, edges)
+        sections.append(data)
+    return (vertices, *sections)
+
+def write_binary_edge_list(path, vertices, sources, destinations, weights):
+    """Write the compact binary edge list: header, then sources, destinations, weights arrays"""
+    with open(path, 'wb') as f:
+        f.write(_CSR_HEADER.pack(_EDGES_MAGIC, vertices, len(sources)))
+        array('q', sources).tofile(f)
+        array('q', destinations).tofile(f)
+        array('d', weights).tofile(f)
+
+def load_csr_graph(path):
+    """Bulk-load an edge list file (text or binary) into a CSRGraph"""
+    return CSRGraph.from_edge_arrays(*read_edge_list(path))
+
+def label_components(csr):
+    """
+    Label every vertex with its connected component id (BFS per component).
+    Returns (component_ids as array('q'), number of components).
+    """
+    offsets, targets = csr.offsets, csr.targets
+    component = array('q', [-1]) * csr.V
+    queue = array('q', [0]) * csr.V  # each vertex is enqueued exactly once
+    count = 0
+    
+    for start in range(csr.V):
+        if component[start] != -1:
+            continue
+        component[start] = count
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            vertex = queue[head]
+            head += 1
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[i]
+                if component[neighbor] == -1:
+                    component[neighbor] = count
+                    queue[tail] = neighbor
+                    tail += 1
+        count += 1
+    
+    return component, count
+
+def two_color(csr):
+    """
+    Two-color every connected component.
+    Returns (colors as array('b'), component_ids as array('q'),
+    bipartite as bytearray with one flag per component). Colors inside a
+    non-bipartite component are a BFS layering, not a valid coloring.
+    """
+    offsets, targets = csr.offsets, csr.targets
+    colors = array('b', [-1]) * csr.V
+    component = array('q', [-1]) * csr.V
+    queue = array('q', [0]) * csr.V
+    bipartite = bytearray()
+    
+    for start in range(csr.V):
+        if component[start] != -1:
+            continue
+        label = len(bipartite)
+        ok = 1
+        component[start] = label
+        colors[start] = 0
+        queue[0] = start
+        head, tail = 0, 1
+        while head < tail:
+            vertex = queue[head]
+            head += 1
+            flipped = 1 - colors[vertex]
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[i]
+                if component[neighbor] == -1:
+                    component[neighbor] = label
+                    colors[neighbor] = flipped
+                    queue[tail] = neighbor
+                    tail += 1
+                elif colors[neighbor] != flipped:
+                    ok = 0
+        bipartite.append(ok)
+    
+    return colors, component, bipartite
+
+def _seed_sources(levels, sources):
+    """Mark sources (one vertex or an iterable) as level 0; returns them deduplicated in order"""
+    if isinstance(sources, int):
+        sources = (sources,)
+    seeds = []
+    for source in sources:
+        if levels[source] == -1:
+            levels[source] = 0
+            seeds.append(source)
+    return seeds
+
+def bfs_levels(csr, sources):
+    """
+    Sequential level-synchronous BFS from one vertex or an iterable of
+    vertices (all at level 0); returns array('q') of hop distances to the
+    nearest source (-1 if unreachable).
+    """
+    offsets, targets = csr.offsets, csr.targets
+    levels = array('q', [-1]) * csr.V
+    frontier = _seed_sources(levels, sources)
+    depth = 0
+    
+    while frontier:
+        depth += 1
+        next_frontier = []
+        for vertex in frontier:
+            for i in range(offsets[vertex], offsets[vertex + 1]):
+                neighbor = targets[i]
+                if levels[neighbor] == -1:
+                    levels[neighbor] = depth
+                    next_frontier.append(neighbor)
+        frontier = next_frontier
+    
+    return levels
+
+# Per-worker views of the shared CSR, set up once by the pool initializer
+_shared_views = None
+
+def _attach_shared(names):
+    global _shared_views
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    _shared_views = (blocks, [block.buf.cast('q') for block in blocks])
+
+def _expand_frontier(task):
+    """Worker task: neighbours of frontier[lo:hi] that are still unvisited"""
+    buffer, lo, hi = task
+    _, (offsets, targets, levels, *frontiers) = _shared_views
+    frontier = frontiers[buffer]
+    found = array('q')
+    for j in range(lo, hi):
+        vertex = frontier[j]
+        for i in range(offsets[vertex], offsets[vertex + 1]):
+            neighbor = targets[i]
+            if levels[neighbor] == -1:
+                found.append(neighbor)
+    return found
+
+def parallel_bfs_levels(csr, sources, workers=4, min_chunk=1024):
+    """
+    Level-synchronous BFS with each frontier split across a process pool.
+    
+    offsets, targets, the level array and two frontier buffers live in
+    shared memory, so workers read the CSR in place instead of receiving
+    a pickled copy. Workers only read; the parent dedups the candidates
+    they return and writes the next level into the other frontier buffer,
+    so no locking is needed.
+    sources is one vertex or an iterable of vertices, as in bfs_levels.
+    Returns array('q') of hop distances like bfs_levels.
+    """
+    sizes = (len(csr.offsets), len(csr.targets), csr.V, csr.V, csr.V)
+    blocks = [shared_memory.SharedMemory(create=True, size=max(8, 8 * n)) for n in sizes]
+    views = []
+    try:
+        views = [block.buf.cast('q') for block in blocks]
+        offsets, targets, levels, *frontiers = views
+        offsets[:len(csr.offsets)] = memoryview(csr.offsets).cast('B').cast('q')
+        targets[:len(csr.targets)] = memoryview(csr.targets).cast('B').cast('q')
+        for v in range(csr.V):
+            levels[v] = -1
+        seeds = _seed_sources(levels, sources)
+        frontiers[0][:len(seeds)] = array('q', seeds)
+        frontier_size = len(seeds)
+        buffer = 0
+        depth = 0
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_attach_shared,
+                                 initargs=([block.name for block in blocks],)) as pool:
+            while frontier_size:
+                depth += 1
+                chunk = max(min_chunk, -(-frontier_size // workers))
+                tasks = [(buffer, lo, min(lo + chunk, frontier_size)) for lo in range(0, frontier_size, chunk)]
+                buffer = 1 - buffer
+                frontier = frontiers[buffer]
+                frontier_size = 0
+                for found in pool.map(_expand_frontier, tasks):
+                    for neighbor in found:
+                        if levels[neighbor] == -1:
+                            levels[neighbor] = depth
+                            frontier[frontier_size] = neighbor
+                            frontier_size += 1
+        
+        return array('q', levels[:csr.V])
+    finally:
+        for view in views:
+            view.release()
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+def make_grid_graph(rows, cols, weight=1, max_weight=None, seed=None):
+    """
+    Build a 4-connected rows x cols grid with coordinates attached.
+    With max_weight, edge weights are random integers in [weight, max_weight].
+    """
+    rng = random.Random(seed)
+    grid = Graph(rows * cols, dense=False)
+    for r in range(rows):
+        for c in range(cols):
+            vertex = r * cols + c
+            grid.set_position(vertex, c, r)
+            if c + 1 < cols:
+                grid.add_edge(vertex, vertex + 1, rng.randint(weight, max_weight) if max_weight else weight)
+            if r + 1 < rows:
+                grid.add_edge(vertex, vertex + cols, rng.randint(weight, max_weight) if max_weight else weight)
+    return grid
+
+def make_random_graph(vertices, edges, max_weight=100, seed=None):
+    """Random connected graph: a random spanning tree plus extra random edges"""
+    rng = random.Random(seed)
+    graph = Graph(vertices, dense=False)
+    for v in range(1, vertices):
+        graph.add_edge(rng.randrange(v), v, rng.randint(1, max_weight))
+    for _ in range(max(0, edges - (vertices - 1))):
+        u, v = rng.randrange(vertices), rng.randrange(vertices)
+        if u != v:
+            graph.add_edge(u, v, rng.randint(1, max_weight))
+    return graph
+
+def make_erdos_renyi_graph(vertices, avg_degree=8, max_weight=100, seed=None):
+    """Erdős–Rényi G(n, m) random graph with m = n * avg_degree / 2 edges"""
+    rng = random.Random(seed)
+    graph = Graph(vertices, dense=False)
+    if vertices < 2:
+        return graph
+    for _ in range(vertices * avg_degree // 2):
+        u, v = rng.randrange(vertices), rng.randrange(vertices)
+        if u != v:
+            graph.add_edge(u, v, rng.randint(1, max_weight))
+    return graph
+
+def make_power_law_graph(vertices, edges_per_vertex=3, max_weight=100, seed=None):
+    """Barabási–Albert preferential attachment graph (power-law degree distribution)"""
+    rng = random.Random(seed)
+    graph = Graph(vertices, dense=False)
+    # Every edge endpoint is appended here, so a uniform pick from it is a
+    # degree-proportional pick of a vertex
+    endpoints = []
+    for v in range(1, vertices):
+        for _ in range(min(edges_per_vertex, v)):
+            u = rng.choice(endpoints) if endpoints else rng.randrange(v)
+            if u != v:
+                graph.add_edge(u, v, rng.randint(1, max_weight))
+                endpoints.extend((u, v))
+    return graph
+
+GRAPH_GENERATORS = {
+    "er": lambda n, seed: make_erdos_renyi_graph(n, seed=seed),
+    "grid": lambda n, seed: make_grid_graph(math.isqrt(n), math.isqrt(n), max_weight=10, seed=seed),
+    "power-law": lambda n, seed: make_power_law_graph(n, seed=seed),
+}
+
+def benchmark_a_star(side=1000):
+    """Time A* variants corner-to-corner on a side x side grid (1M vertices by default)"""
+    grid = make_grid_graph(side, side)
+    start, goal = 0, side * side - 1
+    variants = [
+        ("Dijkstra (no heuristic)", dict()),
+        ("A* Manhattan", dict(heuristic=manhattan_heuristic(grid))),
+        ("A* Euclidean", dict(heuristic=euclidean_heuristic(grid))),
+        ("Bidirectional Dijkstra", dict(bidirectional=True)),
+        ("Bidirectional A* Manhattan", dict(heuristic=manhattan_heuristic(grid), bidirectional=True)),
+    ]
+    results = {}
+    print(f"\nA* benchmark on {side}x{side} grid ({grid.V:,} vertices)")
+    for name, kwargs in variants:
+        t0 = time.perf_counter()
+        path, cost = a_star_shortest_path(grid, start, goal, **kwargs)
+        elapsed = time.perf_counter() - t0
+        results[name] = (elapsed, cost)
+        print(f"  {name:<28} cost={cost:<8} time={elapsed:.3f}s")
+    return results
+
+def benchmark_mst(seed=42):
+    """Time Prim against Kruskal on sparse (E ~ 4V) and dense (E ~ V^2 / 4) graphs"""
+    cases = [
+        ("sparse", 100_000, 400_000),
+        ("dense", 2_000, 1_000_000),
+    ]
+    results = {}
+    print("\nMST benchmark: Prim vs Kruskal")
+    for label, vertices, edges in cases:
+        graph = make_random_graph(vertices, edges, seed=seed)
+        timings = {}
+        for name, algorithm in (("prim", prims_mst), ("kruskal", kruskal_mst)):
+            t0 = time.perf_counter()
+            _, weight = algorithm(graph)
+            timings[name] = time.perf_counter() - t0
+        results[label] = timings
+        print(f"  {label:<7} V={vertices:,} E~{edges:,}  prim={timings['prim']:.2f}s  kruskal={timings['kruskal']:.2f}s  weight={weight}")
+    return results
+
+def benchmark_shortest_path_index(side=300, queries=200, seed=42):
+    """Compare p50 query latency: plain Dijkstra-mode A*, ALT A*, and ALT with a warm cache"""
+    graph = make_grid_graph(side, side, max_weight=10, seed=seed)
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(graph.V), rng.randrange(graph.V)) for _ in range(queries)]
+    index = ShortestPathIndex(graph)
+    
+    t0 = time.perf_counter()
+    index.preprocess()
+    preprocess_time = time.perf_counter() - t0
+    
+    def p50(query):
+        latencies = []
+        for start, goal in pairs:
+            t = time.perf_counter()
+            query(start, goal)
+            latencies.append(time.perf_counter() - t)
+        return statistics.median(latencies)
+    
+    results = {
+        "plain": p50(lambda s, g: a_star_shortest_path(graph, s, g)),
+        "alt": p50(index.shortest_path),
+        "alt_cached": p50(index.shortest_path),
+    }
+    print(f"\nShortest-path index on {side}x{side} weighted grid ({graph.V:,} vertices)")
+    print(f"  Preprocessing ({len(index.landmarks)} landmarks): {preprocess_time:.2f}s")
+    for name, latency in results.items():
+        print(f"  p50 {name:<11} {latency * 1000:9.3f} ms")
+    return results
+
+def benchmark_parallel_bfs(side=700, worker_counts=(1, 2, 4, 8, 16)):
+    """Scaling of parallel_bfs_levels over worker counts on a side x side grid"""
+    csr = CSRGraph.from_graph(make_grid_graph(side, side))
+    t0 = time.perf_counter()
+    expected = bfs_levels(csr, 0)
+    sequential = time.perf_counter() - t0
+    results = {"sequential": sequential}
+    print(f"\nParallel BFS on {side}x{side} grid ({csr.V:,} vertices)")
+    print(f"  sequential   {sequential:.2f}s")
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        levels = parallel_bfs_levels(csr, 0, workers)
+        elapsed = time.perf_counter() - t0
+        assert levels == expected
+        results[workers] = elapsed
+        print(f"  {workers:>2} workers   {elapsed:.2f}s  (speedup {sequential / elapsed:.2f}x)")
+    return results
+
+def benchmark_incremental_mst(vertices=50_000, edges=200_000, seed=42):
+    """Per-insertion cost of IncrementalMST against recomputing the forest after each add_edge"""
+    rng = random.Random(seed)
+    stream = [(rng.randrange(vertices), rng.randrange(vertices), rng.randint(1, 1000)) for _ in range(edges)]
+    graph = Graph(vertices, dense=False)
+    mst = graph.track_mst()
+    
+    t0 = time.perf_counter()
+    for u, v, weight in stream:
+        graph.add_edge(u, v, weight)
+    incremental = (time.perf_counter() - t0) / edges
+    
+    # A random stream rarely connects every vertex, so Prim would just
+    # return []; Kruskal's spanning forest is the comparable recomputation
+    t0 = time.perf_counter()
+    _, kruskal_weight = kruskal_mst(graph)
+    recompute = time.perf_counter() - t0
+    assert mst.total_weight == kruskal_weight
+    
+    print(f"\nIncremental MST: V={vertices:,}, {edges:,} streamed edges")
+    print(f"  add_edge + MST update:   {incremental * 1e6:.1f} µs per edge (MST weight {mst.total_weight})")
+    print(f"  one Kruskal recomputation: {recompute * 1e3:.1f} ms")
+    return {"incremental_per_edge": incremental, "recompute": recompute}
+
+def _measure(func, repeat):
+    """Best-of-repeat wall time (at least one run), plus peak traced allocation of one extra run"""
+    best = math.inf
+    for _ in range(max(repeat, 1)):
+        t0 = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - t0)
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+def run_benchmarks(generator, vertices, seed=42, repeat=3, queries=20):
+    """
+    Time each algorithm on a generated graph.
+    Returns a JSON-ready dict with ops/sec (algorithm runs per second, or
+    queries per second for a_star; None if the run was too fast to time)
+    and peak traced memory in bytes.
+    """
+    build_time, build_peak = _measure(lambda: GRAPH_GENERATORS[generator](vertices, seed), 1)
+    graph = GRAPH_GENERATORS[generator](vertices, seed)
+    csr = CSRGraph.from_graph(graph)
+    rng = random.Random(seed)
+    pairs = [(rng.randrange(graph.V), rng.randrange(graph.V)) for _ in range(queries)]
+    
+    def a_star_queries():
+        for start, goal in pairs:
+            a_star_shortest_path(graph, start, goal)
+    
+    algorithms = {
+        "completeness": (lambda: check_completeness(graph), 1),
+        "connectivity_dfs": (lambda: check_connectivity_dfs(graph), 1),
+        "connectivity_union_find": (lambda: check_connectivity(graph), 1),
+        "bipartiteness": (lambda: check_bipartiteness(graph), 1),
+        "label_components": (lambda: label_components(csr), 1),
+        "two_color": (lambda: two_color(csr), 1),
+        "a_star": (a_star_queries, len(pairs)),
+        "prims_mst": (lambda: prims_mst(graph), 1),
+        "kruskal_mst": (lambda: kruskal_mst(graph), 1),
+    }
+    report = {
+        "generator": generator,
+        "vertices": graph.V,
+        "edges": graph.edge_count,
+        "seed": seed,
+        "build": {"seconds": build_time, "peak_memory_bytes": build_peak},
+        "algorithms": {},
+    }
+    for name, (func, ops) in algorithms.items():
+        seconds, peak = _measure(func, repeat)
+        report["algorithms"][name] = {
+            "seconds": seconds,
+            "ops_per_sec": ops / seconds if seconds else None,
+            "peak_memory_bytes": peak,
+        }
+    return report
+
+def _positive_int(text):
+    value = int(text)
+    if value < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return value
+
+def _non_negative_int(text):
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError(f"must be at least 0, got {value}")
+    return value
+
+def bench(argv=None):
+    """CLI entry point: python lab4_graph_alg.py bench --graph er --vertices 100000"""
+    parser = argparse.ArgumentParser(prog="lab4_graph_alg.py bench",
+                                     description="Time graph algorithms on a generated graph, report JSON")
+    parser.add_argument("--graph", choices=sorted(GRAPH_GENERATORS), default="er")
+    parser.add_argument("--vertices", type=_positive_int, default=10_000)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--repeat", type=_positive_int, default=3)
+    parser.add_argument("--queries", type=_non_negative_int, default=20, help="A* start/goal pairs")
+    args = parser.parse_args(argv)
+    report = run_benchmarks(args.graph, args.vertices, args.seed, args.repeat, args.queries)
+    print(json.dumps(report, indent=2, allow_nan=False))
+    return report
+
+def main():
+    print("=" * 60)
+    print("LAB 4: GRAPH ALGORITHMS DEMONSTRATION")
+    print("=" * 60)
+
+    # Create a sample graph
+    g = Graph(6)
+    g.add_edge(0, 1, 4)
+    g.add_edge(0, 2, 3)
+    g.add_edge(1, 2, 1)
+    g.add_edge(1, 3, 2)
+    g.add_edge(2, 3, 4)
+    g.add_edge(3, 4, 2)
+    g.add_edge(4, 5, 6)
+
+    print("\nGraph Structure:")
+    print(f"Vertices: {g.V}")
+    print(f"Edges: {list(g.get_edges())}")
+
+    print("\n" + "=" * 60)
+    print("GRAPH PROPERTIES")
+    print("=" * 60)
+
+    # Check completeness
+    is_complete = check_completeness(g)
+    print(f"\n1. Completeness: {'✓ Complete' if is_complete else '✗ Not Complete'}")
+    print(f"   Expected edges for complete graph: {(g.V * (g.V - 1)) // 2}")
+    print(f"   Actual edges: {g.edge_count}")
+
+    # Check connectivity
+    is_connected = check_connectivity_dfs(g)
+    print(f"\n2. Connectivity: {'✓ Connected' if is_connected else '✗ Not Connected'}")
+    print(f"   Components (union-find): {count_components(g)}")
+
+    # Check bipartiteness
+    is_bipartite, coloring = check_bipartiteness(g)
+    print(f"\n3. Bipartiteness: {'✓ Bipartite' if is_bipartite else '✗ Not Bipartite'}")
+    if is_bipartite:
+        set_a = [i for i, c in enumerate(coloring) if c == 0]
+        set_b = [i for i, c in enumerate(coloring) if c == 1]
+        print(f"   Set A: {set_a}")
+        print(f"   Set B: {set_b}")
+
+    print("\n" + "=" * 60)
+    print("SHORTEST PATH (A* ALGORITHM)")
+    print("=" * 60)
+
+    start, goal = 0, 5
+    path, cost = a_star_shortest_path(g, start, goal)
+    print(f"\nFinding shortest path from vertex {start} to vertex {goal}")
+    if path:
+        print(f"Path: {' → '.join(map(str, path))}")
+        print(f"Total cost: {cost}")
+    else:
+        print("No path exists")
+
+    # Heuristic search on a grid where vertices carry coordinates
+    grid = make_grid_graph(20, 20)
+    grid_goal = grid.V - 1
+    print(f"\nGrid 20x20, corner to corner (0 → {grid_goal}):")
+    for label, kwargs in [
+        ("No heuristic", {}),
+        ("Manhattan", {"heuristic": manhattan_heuristic(grid)}),
+        ("Bidirectional + Manhattan", {"heuristic": manhattan_heuristic(grid), "bidirectional": True}),
+    ]:
+        _, grid_cost = a_star_shortest_path(grid, 0, grid_goal, **kwargs)
+        print(f"  {label:<26} cost: {grid_cost}")
+
+    # Repeated queries: landmark (ALT) heuristic plus an LRU result cache
+    index = ShortestPathIndex(g, num_landmarks=2)
+    for _ in range(3):
+        index.shortest_path(start, goal)
+    print(f"\nLandmarks: {index.landmarks}, cache hits: {index.hits}, misses: {index.misses}")
+
+    print("\n" + "=" * 60)
+    print("MINIMUM SPANNING TREE (PRIM'S ALGORITHM)")
+    print("=" * 60)
+
+    mst_edges, total_weight = prims_mst(g)
+    print(f"\nMST Edges:")
+    for u, v, weight in mst_edges:
+        print(f"  {u} ↔ {v} (weight: {weight})")
+    print(f"\nTotal MST weight: {total_weight}")
+    
+    # Streaming insertions: the MST is updated per edge instead of recomputed
+    streaming_g = Graph(6)
+    streaming_g.track_mst()
+    print("\nIncremental MST under a stream of add_edge calls:")
+    for u, v, weight in [(0, 1, 4), (1, 2, 3), (0, 2, 1), (2, 3, 5), (3, 4, 2), (1, 3, 1), (4, 5, 6), (2, 5, 2)]:
+        streaming_g.add_edge(u, v, weight)
+        print(f"  + {u} ↔ {v} (weight: {weight})  →  MST weight: {streaming_g.mst.total_weight}")
+
+    print("\n" + "=" * 60)
+    print("TESTING WITH DIFFERENT GRAPH TYPES")
+    print("=" * 60)
+
+    # Test with a complete graph
+    print("\n1. Complete Graph (K4):")
+    complete_g = Graph(4)
+    for i in range(4):
+        for j in range(i + 1, 4):
+            complete_g.add_edge(i, j, 1)
+    print(f"   Complete: {check_completeness(complete_g)}")
+    print(f"   Connected: {check_connectivity_dfs(complete_g)}")
+    print(f"   Bipartite: {check_bipartiteness(complete_g)[0]}")
+
+    # Test with a bipartite graph
+    print("\n2. Bipartite Graph:")
+    bipartite_g = Graph(4)
+    bipartite_g.add_edge(0, 2, 1)
+    bipartite_g.add_edge(0, 3, 1)
+    bipartite_g.add_edge(1, 2, 1)
+    bipartite_g.add_edge(1, 3, 1)
+    print(f"   Complete: {check_completeness(bipartite_g)}")
+    print(f"   Connected: {check_connectivity_dfs(bipartite_g)}")
+    is_bip, col = check_bipartiteness(bipartite_g)
+    print(f"   Bipartite: {is_bip}")
+    if is_bip:
+        print(f"   Coloring: {col}")
+
+    # Test with a disconnected graph
+    print("\n3. Disconnected Graph:")
+    disconnected_g = Graph(5)
+    disconnected_g.add_edge(0, 1, 1)
+    disconnected_g.add_edge(2, 3, 1)
+    print(f"   Complete: {check_completeness(disconnected_g)}")
+    print(f"   Connected: {check_connectivity_dfs(disconnected_g)}")
+    print(f"   Components: {count_components(disconnected_g)}")
+    print(f"   Bipartite: {check_bipartiteness(disconnected_g)[0]}")
+    forest_edges, forest_weight = kruskal_mst(disconnected_g)
+    print(f"   Prim MST: {prims_mst(disconnected_g)[0]}")
+    print(f"   Kruskal spanning forest: {forest_edges} (weight: {forest_weight})")
+    colors, component_ids, bipartite_flags = two_color(CSRGraph.from_graph(disconnected_g))
+    print(f"   Component ids: {component_ids.tolist()}")
+    print(f"   Coloring: {colors.tolist()} (bipartite per component: {list(bipartite_flags)})")
+
+    print("\n" + "=" * 60)
+    print("DEMONSTRATION COMPLETE")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        bench(sys.argv[2:])
+    else:
+        main()
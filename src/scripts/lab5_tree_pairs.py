@@ -3,78 +3,296 @@ Lab 5: Trees – Using Trees for Searching
 Task: Find all pairs of nodes in a tree whose values sum up to a given target
 """
 
-from typing import List, Tuple, Optional, Set
+from typing import Dict, Iterable, Iterator, List, Tuple, Optional, Set
 from collections import deque
+from itertools import islice
+import heapq
+import random
+import time
+import tracemalloc
 
 
 class TreeNode:
     """Binary Search Tree Node"""
+    __slots__ = ("value", "left", "right", "height", "size")
+    
     def __init__(self, value: int):
         self.value = value
         self.left: Optional['TreeNode'] = None
         self.right: Optional['TreeNode'] = None
+        self.height = 1  # height of the subtree rooted here
+        self.size = 1  # number of nodes in the subtree rooted here
+
+
+def _height(node: Optional[TreeNode]) -> int:
+    return node.height if node else 0
+
+
+def _size(node: Optional[TreeNode]) -> int:
+    return node.size if node else 0
+
+
+def _update(node: TreeNode) -> None:
+    node.height = 1 + max(_height(node.left), _height(node.right))
+    node.size = 1 + _size(node.left) + _size(node.right)
+
+
+class BSTIterator:
+    """
+    Stack-based in-order iterator over BST nodes, ascending or descending.
+    Holds at most one root-to-leaf path, i.e. O(h) memory.
+    """
+    
+    def __init__(self, root: Optional[TreeNode], reverse: bool = False):
+        self.reverse = reverse
+        self.stack: List[TreeNode] = []
+        self._push_spine(root)
+    
+    def _push_spine(self, node: Optional[TreeNode]) -> None:
+        while node:
+            self.stack.append(node)
+            node = node.right if self.reverse else node.left
+    
+    def __iter__(self) -> 'BSTIterator':
+        return self
+    
+    def __next__(self) -> TreeNode:
+        if not self.stack:
+            raise StopIteration
+        node = self.stack.pop()
+        self._push_spine(node.left if self.reverse else node.right)
+        return node
 
 
 class BinarySearchTree:
-    """Binary Search Tree implementation with pair-finding algorithms"""
+    """
+    Binary Search Tree implementation with pair-finding algorithms
+    
+    With balanced=True the tree is kept AVL-balanced on insert, which
+    bounds its height by ~1.44 log2(n) regardless of insertion order.
+    """
     
-    def __init__(self):
+    def __init__(self, balanced: bool = False):
         self.root: Optional[TreeNode] = None
+        self.balanced = balanced
+        # Batch query indexes, built on first use and dropped on insert
+        self._sorted_cache: Optional[List[int]] = None
+        self._count_cache: Optional[Dict[int, int]] = None
+        # Nodes whose child heights differ by more than 1 (plain mode only)
+        self._unbalanced_nodes = 0
+    
+    @classmethod
+    def from_iterable(cls, values: Iterable[int], presorted: bool = False, balanced: bool = False) -> 'BinarySearchTree':
+        """
+        Build a perfectly balanced tree in one pass instead of n inserts.
+        Sorts once unless presorted=True; the build itself is O(n).
+        """
+        tree = cls(balanced=balanced)
+        ordered = list(values) if presorted else sorted(values)
+        tree.root = cls._build_balanced(ordered, 0, len(ordered))
+        return tree
+    
+    @classmethod
+    def _build_balanced(cls, values: List[int], lo: int, hi: int) -> Optional[TreeNode]:
+        # Middle element as root; recursion depth is only log2(n)
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = TreeNode(values[mid])
+        node.left = cls._build_balanced(values, lo, mid)
+        node.right = cls._build_balanced(values, mid + 1, hi)
+        _update(node)
+        return node
+    
+    def bulk_merge(self, values: Iterable[int], presorted: bool = False) -> None:
+        """
+        Merge a batch into the tree: a linear merge of the in-order sequence
+        with the sorted batch, then a balanced rebuild. O(n + m) plus
+        O(m log m) to sort the batch unless presorted=True.
+        """
+        batch = list(values) if presorted else sorted(values)
+        merged = list(heapq.merge(self._iter_in_order(self.root), batch))
+        self.root = self._build_balanced(merged, 0, len(merged))
+        self._sorted_cache = None
+        self._count_cache = None
+        self._unbalanced_nodes = 0
     
     def insert(self, value: int) -> None:
-        """Insert a value into the BST"""
+        """Insert a value into the BST (iterative, so deep trees cannot overflow the stack)"""
+        self._sorted_cache = None
+        self._count_cache = None
         if not self.root:
             self.root = TreeNode(value)
+            return
+        
+        path = []
+        node = self.root
+        while node:
+            node.size += 1
+            path.append(node)
+            node = node.left if value < node.value else node.right
+        
+        parent = path[-1]
+        new_node = TreeNode(value)
+        if value < parent.value:
+            parent.left = new_node
         else:
-            self._insert_recursive(self.root, value)
+            parent.right = new_node
+        
+        if self.balanced:
+            self._rebalance_path(path)
+        else:
+            self._update_heights(path, new_node)
     
-    def _insert_recursive(self, node: TreeNode, value: int) -> None:
-        if value < node.value:
-            if node.left is None:
-                node.left = TreeNode(value)
+    def _update_heights(self, path: List[TreeNode], child: TreeNode) -> None:
+        """
+        Refresh heights bottom-up after a plain insert and keep the count of
+        unbalanced nodes current. Only nodes on the path can change, and
+        the walk stops at the first node whose height is unchanged.
+        """
+        child_old_height = 0
+        for node in reversed(path):
+            left_height, right_height = _height(node.left), _height(node.right)
+            if node.left is child:
+                old_balance = child_old_height - right_height
             else:
-                self._insert_recursive(node.left, value)
-        else:
-            if node.right is None:
-                node.right = TreeNode(value)
+                old_balance = left_height - child_old_height
+            self._unbalanced_nodes += (abs(left_height - right_height) > 1) - (abs(old_balance) > 1)
+            
+            child_old_height = node.height
+            node.height = 1 + max(left_height, right_height)
+            if node.height == child_old_height:
+                break
+            child = node
+    
+    def _rebalance_path(self, path: List[TreeNode]) -> None:
+        """Restore AVL heights and balance bottom-up along the insertion path"""
+        for i in range(len(path) - 1, -1, -1):
+            node = path[i]
+            old_height = node.height
+            _update(node)
+            subtree = self._rebalance(node)
+            
+            if subtree is not node:
+                if i == 0:
+                    self.root = subtree
+                elif path[i - 1].left is node:
+                    path[i - 1].left = subtree
+                else:
+                    path[i - 1].right = subtree
+            
+            if subtree.height == old_height:
+                break  # heights above are unaffected; sizes were set on the way down
+    
+    def _rebalance(self, node: TreeNode) -> TreeNode:
+        balance = _height(node.left) - _height(node.right)
+        if balance > 1:
+            if _height(node.left.left) < _height(node.left.right):
+                node.left = self._rotate_left(node.left)
+            return self._rotate_right(node)
+        if balance < -1:
+            if _height(node.right.right) < _height(node.right.left):
+                node.right = self._rotate_right(node.right)
+            return self._rotate_left(node)
+        return node
+    
+    @staticmethod
+    def _rotate_left(node: TreeNode) -> TreeNode:
+        pivot = node.right
+        node.right = pivot.left
+        pivot.left = node
+        _update(node)
+        _update(pivot)
+        return pivot
+    
+    @staticmethod
+    def _rotate_right(node: TreeNode) -> TreeNode:
+        pivot = node.left
+        node.left = pivot.right
+        pivot.right = node
+        _update(node)
+        _update(pivot)
+        return pivot
+    
+    def contains(self, value: int) -> bool:
+        """Check whether value is stored in the tree. Time: O(h)"""
+        node = self.root
+        while node:
+            if value == node.value:
+                return True
+            node = node.left if value < node.value else node.right
+        return False
+    
+    def __iter__(self) -> Iterator[int]:
+        return self._iter_in_order(self.root)
+    
+    def iter_in_order(self) -> Iterator[int]:
+        """Lazily yield values Left -> Node -> Right (sorted) with an explicit stack"""
+        return self._iter_in_order(self.root)
+    
+    def iter_pre_order(self) -> Iterator[int]:
+        """Lazily yield values Node -> Left -> Right"""
+        return self._iter_pre_order(self.root)
+    
+    def iter_post_order(self) -> Iterator[int]:
+        """Lazily yield values Left -> Right -> Node"""
+        return self._iter_post_order(self.root)
+    
+    @staticmethod
+    def _iter_in_order(node: Optional[TreeNode]) -> Iterator[int]:
+        stack: List[TreeNode] = []
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            yield node.value
+            node = node.right
+    
+    @staticmethod
+    def _iter_pre_order(node: Optional[TreeNode]) -> Iterator[int]:
+        stack = [node] if node else []
+        while stack:
+            node = stack.pop()
+            yield node.value
+            if node.right:
+                stack.append(node.right)
+            if node.left:
+                stack.append(node.left)
+    
+    @staticmethod
+    def _iter_post_order(node: Optional[TreeNode]) -> Iterator[int]:
+        stack: List[TreeNode] = []
+        last_visited: Optional[TreeNode] = None
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            top = stack[-1]
+            if top.right and top.right is not last_visited:
+                node = top.right
             else:
-                self._insert_recursive(node.right, value)
+                stack.pop()
+                yield top.value
+                last_visited = top
     
     def in_order_traversal(self, node: Optional[TreeNode] = None, first_call: bool = True) -> List[int]:
         """In-order traversal (Left -> Node -> Right) - produces sorted sequence"""
         if first_call:
             node = self.root
-        
-        result = []
-        if node:
-            result.extend(self.in_order_traversal(node.left, False))
-            result.append(node.value)
-            result.extend(self.in_order_traversal(node.right, False))
-        return result
+        return list(self._iter_in_order(node))
     
     def pre_order_traversal(self, node: Optional[TreeNode] = None, first_call: bool = True) -> List[int]:
         """Pre-order traversal (Node -> Left -> Right)"""
         if first_call:
             node = self.root
-        
-        result = []
-        if node:
-            result.append(node.value)
-            result.extend(self.pre_order_traversal(node.left, False))
-            result.extend(self.pre_order_traversal(node.right, False))
-        return result
+        return list(self._iter_pre_order(node))
     
     def post_order_traversal(self, node: Optional[TreeNode] = None, first_call: bool = True) -> List[int]:
         """Post-order traversal (Left -> Right -> Node)"""
         if first_call:
             node = self.root
-        
-        result = []
-        if node:
-            result.extend(self.post_order_traversal(node.left, False))
-            result.extend(self.post_order_traversal(node.right, False))
-            result.append(node.value)
-        return result
+        return list(self._iter_post_order(node))
     
     def level_order_traversal(self) -> List[List[int]]:
         """Level-order (BFS) traversal - returns values level by level"""
@@ -120,66 +338,168 @@ class BinarySearchTree:
         
         return pairs
     
-    def find_pairs_two_pointer(self, target: int) -> List[Tuple[int, int]]:
+    def find_pairs_two_pointer(self, target: int, k: Optional[int] = None) -> List[Tuple[int, int]]:
         """
         Find all pairs with sum equal to target using Two-Pointer approach
         Utilizes the sorted property of BST in-order traversal
+        Returns only the first k pairs (smallest first element) if k is given
         Time Complexity: O(n)
-        Space Complexity: O(n) for storing traversal
+        Space Complexity: O(h) - see iter_pairs
         """
-        sorted_values = self.in_order_traversal()  # Already sorted for BST
-        pairs = []
-        left = 0
-        right = len(sorted_values) - 1
+        return list(islice(self.iter_pairs(target), k))
+    
+    def iter_pairs(self, target: int) -> Iterator[Tuple[int, int]]:
+        """
+        Lazily yield pairs summing to target, ordered by the smaller value.
+        An ascending and a descending BSTIterator walk toward each other
+        like two pointers over the in-order sequence, so only two stacks
+        of O(h) nodes are held and the walk stops once they cross.
+        """
+        ascending = BSTIterator(self.root)
+        descending = BSTIterator(self.root, reverse=True)
+        low = next(ascending, None)
+        high = next(descending, None)
         
-        while left < right:
-            current_sum = sorted_values[left] + sorted_values[right]
+        # The pointers are distinct tree positions; they have crossed as
+        # soon as they land on the same node
+        while low is not None and high is not None and low is not high:
+            current_sum = low.value + high.value
             
             if current_sum == target:
-                pairs.append((sorted_values[left], sorted_values[right]))
-                left += 1
-                right -= 1
+                yield (low.value, high.value)
+                low = next(ascending)
+                if low is high:
+                    break
+                high = next(descending)
             elif current_sum < target:
-                left += 1
+                low = next(ascending)
             else:
-                right -= 1
+                high = next(descending)
+    
+    def _sorted_values(self) -> List[int]:
+        if self._sorted_cache is None:
+            self._sorted_cache = list(self._iter_in_order(self.root))
+        return self._sorted_cache
+    
+    def _value_counts(self) -> Dict[int, int]:
+        """value -> multiplicity, keys in ascending order"""
+        if self._count_cache is None:
+            counts: Dict[int, int] = {}
+            for value in self._sorted_values():
+                counts[value] = counts.get(value, 0) + 1
+            self._count_cache = counts
+        return self._count_cache
+    
+    def find_pairs_batch(self, targets: Iterable[int]) -> Dict[int, List[Tuple[int, int]]]:
+        """
+        Answer find_pairs_two_pointer for many targets with one traversal.
+        The tree is walked once into a cached value->count index (reused
+        until the next insert); each target then scans distinct values
+        v <= target - v only.
+        Time Complexity: O(n) once + O(d) per target, d = distinct values
+        """
+        counts = self._value_counts()
+        results: Dict[int, List[Tuple[int, int]]] = {}
+        for target in targets:
+            pairs: List[Tuple[int, int]] = []
+            for value, count in counts.items():
+                complement = target - value
+                if value > complement:
+                    break
+                if value == complement:
+                    pairs.extend([(value, value)] * (count // 2))
+                elif complement in counts:
+                    pairs.extend([(value, complement)] * min(count, counts[complement]))
+            results[target] = pairs
+        return results
+    
+    def pair_sum_histogram(self, targets: Optional[Iterable[int]] = None) -> Dict[int, int]:
+        """
+        Count pairs of distinct nodes per sum (every pair, not the disjoint
+        matching find_pairs_* returns; the two agree when values are unique).
+        With targets: O(d) per target via the count index. Without: the full
+        histogram, a self-convolution of the value counts in O(d^2).
+        """
+        counts = self._value_counts()
+        if targets is not None:
+            histogram: Dict[int, int] = {}
+            for target in targets:
+                total = 0
+                for value, count in counts.items():
+                    complement = target - value
+                    if value > complement:
+                        break
+                    if value == complement:
+                        total += count * (count - 1) // 2
+                    elif complement in counts:
+                        total += count * counts[complement]
+                histogram[target] = total
+            return histogram
         
-        return pairs
+        histogram = {}
+        distinct = list(counts.items())
+        for i, (a, count_a) in enumerate(distinct):
+            if count_a > 1:
+                histogram[2 * a] = histogram.get(2 * a, 0) + count_a * (count_a - 1) // 2
+            for b, count_b in distinct[i + 1:]:
+                histogram[a + b] = histogram.get(a + b, 0) + count_a * count_b
+        return histogram
     
     def get_height(self, node: Optional[TreeNode] = None, first_call: bool = True) -> int:
-        """Calculate the height of the tree"""
+        """Height of the tree (or of node's subtree), read from the cached field. Time: O(1)"""
         if first_call:
             node = self.root
-        
-        if not node:
-            return 0
-        
-        return 1 + max(self.get_height(node.left, False), self.get_height(node.right, False))
+        return _height(node)
     
     def is_balanced(self, node: Optional[TreeNode] = None, first_call: bool = True) -> bool:
-        """Check if tree is balanced (height difference <= 1 for all nodes)"""
+        """
+        Check if tree is balanced (height difference <= 1 for all nodes)
+        Time: O(1) for the whole tree (AVL mode, or the maintained count of
+        unbalanced nodes); O(subtree size) when asked about a given node.
+        """
         if first_call:
-            node = self.root
-        
-        if not node:
-            return True
+            return self.balanced or self._unbalanced_nodes == 0
         
-        left_height = self.get_height(node.left, False)
-        right_height = self.get_height(node.right, False)
-        
-        return (abs(left_height - right_height) <= 1 and 
-                self.is_balanced(node.left, False) and 
-                self.is_balanced(node.right, False))
+        stack = [node] if node else []
+        while stack:
+            node = stack.pop()
+            if abs(_height(node.left) - _height(node.right)) > 1:
+                return False
+            stack.extend(child for child in (node.left, node.right) if child)
+        return True
     
     def count_nodes(self, node: Optional[TreeNode] = None, first_call: bool = True) -> int:
-        """Count total nodes in tree"""
+        """Count total nodes in tree, read from the cached subtree size. Time: O(1)"""
         if first_call:
             node = self.root
-        
-        if not node:
-            return 0
-        
-        return 1 + self.count_nodes(node.left, False) + self.count_nodes(node.right, False)
+        return _size(node)
+    
+    def kth_smallest(self, k: int) -> int:
+        """k-th smallest value (1-based) using subtree sizes. Time: O(h)"""
+        if not 1 <= k <= _size(self.root):
+            raise IndexError(f"k={k} out of range for tree of {_size(self.root)} nodes")
+        node = self.root
+        while True:
+            left_size = _size(node.left)
+            if k <= left_size:
+                node = node.left
+            elif k == left_size + 1:
+                return node.value
+            else:
+                k -= left_size + 1
+                node = node.right
+    
+    def rank(self, value: int) -> int:
+        """Number of stored values strictly less than value. Time: O(h)"""
+        count = 0
+        node = self.root
+        while node:
+            if value <= node.value:
+                node = node.left
+            else:
+                count += _size(node.left) + 1
+                node = node.right
+        return count
     
     def print_tree(self, node: Optional[TreeNode] = None, level: int = 0, prefix: str = "Root: ", first_call: bool = True):
         """Print tree structure visually"""
@@ -199,6 +519,103 @@ class BinarySearchTree:
                     print(" " * ((level + 1) * 4) + "R--- None")
 
 
+def benchmark_balancing(n: int = 1_000_000, lookups: int = 100_000, unbalanced_limit: int = 20_000) -> Dict[str, Dict[str, float]]:
+    """
+    Time insert and lookup for plain vs AVL trees on sorted, reverse-sorted
+    and random keys. The plain tree degrades to a linked list on ordered
+    input (O(n^2) build), so it is skipped there when n > unbalanced_limit.
+    """
+    rng = random.Random(42)
+    inputs = {
+        "sorted": list(range(n)),
+        "reverse": list(range(n, 0, -1)),
+        "random": rng.sample(range(n * 10), n),
+    }
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"\nInsert/lookup benchmark, n = {n:,}")
+    for order, keys in inputs.items():
+        probes = rng.sample(keys, min(lookups, n))
+        for balanced in (False, True):
+            label = f"{order}/{'avl' if balanced else 'plain'}"
+            if not balanced and order != "random" and n > unbalanced_limit:
+                print(f"  {label:<16} skipped (degenerate O(n^2) build)")
+                continue
+            tree = BinarySearchTree(balanced=balanced)
+            start = time.perf_counter()
+            for key in keys:
+                tree.insert(key)
+            insert_time = time.perf_counter() - start
+            start = time.perf_counter()
+            for key in probes:
+                tree.contains(key)
+            lookup_time = time.perf_counter() - start
+            results[label] = {"insert": insert_time, "lookup": lookup_time}
+            print(f"  {label:<16} insert {insert_time:7.2f}s   {len(probes):,} lookups {lookup_time:6.2f}s")
+    return results
+
+
+def benchmark_traversals(n: int = 1_000_000) -> Dict[str, Dict[str, float]]:
+    """
+    Time and peak traced memory of each traversal on a fully right-skewed
+    tree of n nodes (height n) - the shape that used to hit RecursionError.
+    "list" materializes the result, "stream" only consumes the iterator.
+    """
+    tree = BinarySearchTree()
+    # Link the spine bottom-up directly: inserting sorted keys one by one is O(n^2)
+    for value in range(n - 1, -1, -1):
+        node = TreeNode(value)
+        node.right = tree.root
+        node.height = node.size = n - value
+        tree.root = node
+    tree._unbalanced_nodes = max(0, n - 2)
+    
+    results: Dict[str, Dict[str, float]] = {}
+    print(f"\nTraversal benchmark on a right-skewed tree of {n:,} nodes")
+    for name, as_list, as_iter in (
+        ("in-order", tree.in_order_traversal, tree.iter_in_order),
+        ("pre-order", tree.pre_order_traversal, tree.iter_pre_order),
+        ("post-order", tree.post_order_traversal, tree.iter_post_order),
+    ):
+        for mode, run in (("list", as_list), ("stream", lambda it=as_iter: sum(1 for _ in it()))):
+            start = time.perf_counter()
+            run()
+            elapsed = time.perf_counter() - start
+            tracemalloc.start()
+            run()
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            results[f"{name}/{mode}"] = {"seconds": elapsed, "peak_bytes": peak}
+            print(f"  {name:<10} {mode:<6} {elapsed:6.2f}s   peak {peak / 2**20:7.1f} MiB")
+    return results
+
+
+def benchmark_bulk_load(n: int = 1_000_000) -> Dict[str, float]:
+    """Build time: repeated insert vs from_iterable (unsorted and presorted input)"""
+    keys = random.Random(42).sample(range(n * 10), n)
+    sorted_keys = sorted(keys)
+    
+    def repeated_insert(data: List[int], balanced: bool) -> None:
+        tree = BinarySearchTree(balanced=balanced)
+        for key in data:
+            tree.insert(key)
+    
+    cases = {
+        "insert loop (random, plain)": lambda: repeated_insert(keys, False),
+        "insert loop (sorted, AVL)": lambda: repeated_insert(sorted_keys, True),
+        "from_iterable (random)": lambda: BinarySearchTree.from_iterable(keys),
+        "from_iterable (presorted)": lambda: BinarySearchTree.from_iterable(sorted_keys, presorted=True),
+        "bulk_merge (n/2 + n/2)": lambda: BinarySearchTree.from_iterable(keys[:n // 2]).bulk_merge(keys[n // 2:]),
+    }
+    results: Dict[str, float] = {}
+    print(f"\nBulk build benchmark, n = {n:,}")
+    for name, build in cases.items():
+        start = time.perf_counter()
+        build()
+        results[name] = time.perf_counter() - start
+        print(f"  {name:<28} {results[name]:6.2f}s")
+    return results
+
+
 def main():
     print("=" * 70)
     print("LAB 5: Trees – Using Trees for Searching")
@@ -225,6 +642,7 @@ def main():
     print(f"Total nodes: {bst.count_nodes()}")
     print(f"Tree height: {bst.get_height()}")
     print(f"Is balanced: {bst.is_balanced()}")
+    print(f"3rd smallest: {bst.kth_smallest(3)}, rank of 60: {bst.rank(60)}")
     
     # Traversals
     print("\n3. Tree Traversals")
@@ -257,6 +675,14 @@ def main():
             all_correct = all(a + b == target for a, b in pairs_hashset)
             print(f"{'All pairs sum correctly!' if all_correct else 'Error in pairs!'}")
     
+    # All targets at once: one traversal, answers from the cached index
+    batch = bst.find_pairs_batch(test_targets)
+    counts = bst.pair_sum_histogram(test_targets)
+    print("\nBatch query (single traversal):")
+    for target in test_targets:
+        print(f"  {target}: {counts[target]} pair(s), matches two-pointer: "
+              f"{batch[target] == bst.find_pairs_two_pointer(target)}")
+    
     # Algorithm comparison
     print("\n5. Algorithm Comparison")
     print("-" * 40)
@@ -265,12 +691,13 @@ def main():
     │ Algorithm       │ Time           │ Space           │
     ├─────────────────┼────────────────┼─────────────────┤
     │ HashSet         │ O(n)           │ O(n)            │
-    │ Two-Pointer     │ O(n)           │ O(n)            │
+    │ Two-Pointer     │ O(n)           │ O(h)            │
     │ Brute Force     │ O(n²)          │ O(n)            │
     └─────────────────┴────────────────┴─────────────────┘
     
-    Both HashSet and Two-Pointer approaches have the same complexity,
-    but Two-Pointer is more elegant for BST as it uses the sorted property.
+    Both HashSet and Two-Pointer approaches run in linear time, but
+    Two-Pointer uses the sorted property of the BST: two stack-based
+    iterators (ascending and descending) replace the materialized list.
     """)
     
     # Additional test with larger tree
@@ -278,7 +705,6 @@ def main():
     print("-" * 40)
     
     large_bst = BinarySearchTree()
-    import random
     random.seed(42)
     large_values = random.sample(range(1, 201), 50)  # 50 unique values
     
@@ -287,12 +713,28 @@ def main():
     
     print(f"Created tree with {large_bst.count_nodes()} nodes")
     print(f"Height: {large_bst.get_height()}, Balanced: {large_bst.is_balanced()}")
+    bulk_bst = BinarySearchTree.from_iterable(large_values)
+    print(f"Bulk-built from the same values: height {bulk_bst.get_height()}, "
+          f"Balanced: {bulk_bst.is_balanced()}, same order: {list(bulk_bst) == large_bst.in_order_traversal()}")
     
     target = 150
     pairs = large_bst.find_pairs_hashset(target)
     print(f"\nPairs summing to {target}: {len(pairs)} pairs found")
     if pairs:
         print(f"First 5 pairs: {pairs[:5]}")
+        print(f"First 5 pairs (lazy, two iterators): {large_bst.find_pairs_two_pointer(target, k=5)}")
+    
+    # Balanced mode
+    print("\n7. Balanced (AVL) Mode on Sorted Input")
+    print("-" * 40)
+    sorted_values = list(range(1, 16))
+    for balanced in (False, True):
+        tree = BinarySearchTree(balanced=balanced)
+        for val in sorted_values:
+            tree.insert(val)
+        mode = "AVL" if balanced else "Plain"
+        print(f"{mode:<6} height: {tree.get_height()}, Balanced: {tree.is_balanced()}, "
+              f"pairs summing to 16: {len(tree.find_pairs_two_pointer(16))}")
     
     print("\n" + "=" * 70)
     print("Lab 5 Complete!")
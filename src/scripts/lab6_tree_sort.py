@@ -5,8 +5,28 @@ Objective: Implement a binary tree class with methods for finding
 the successor and predecessor of a given value.
 """
 
+from array import array
+import heapq
+import mmap
+import os
+import random
+import struct
+import threading
+import time
+import tracemalloc
+
+NIL = -1  # null index in ArenaBinarySearchTree
+
+# Snapshot file: 8-byte magic + uint64 count, then the values as int64 in
+# Eytzinger (BFS) order: index k has children 2k + 1 and 2k + 2
+_TREE_MAGIC = b'BSTEYTZ1'
+_TREE_HEADER = struct.Struct('<8sQ')
+
+
 class TreeNode:
     """Node class with parent pointer for efficient traversal"""
+    __slots__ = ("value", "left", "right", "parent", "priority")  # priority: treap mode only
+    
     def __init__(self, value):
         self.value = value
         self.left = None
@@ -17,43 +37,257 @@ class TreeNode:
         return f"TreeNode({self.value})"
 
 
+class ThreadedTreeNode(TreeNode):
+    """Tree node that is also linked into an in-order doubly linked list"""
+    __slots__ = ("prev", "next")
+    
+    def __init__(self, value):
+        super().__init__(value)
+        self.prev = None
+        self.next = None
+
+
 class BinarySearchTree:
     """
     Binary Search Tree implementation with successor/predecessor methods.
     Supports parent pointers for efficient navigation.
+    
+    With threaded=True every node is also linked to its in-order
+    neighbours (prev/next), which makes successor/predecessor O(1).
+    With balanced=True the tree is a treap: nodes get random priorities
+    kept in heap order by rotations, so the expected height stays
+    O(log n) under any mix of inserts and deletes.
     """
     
-    def __init__(self):
+    def __init__(self, threaded=False, balanced=False):
         self.root = None
         self.size = 0
+        self.threaded = threaded
+        self.balanced = balanced
+        self._node_class = ThreadedTreeNode if threaded else TreeNode
+    
+    @classmethod
+    def from_iterable(cls, values, presorted=False, threaded=False, balanced=False):
+        """
+        Build a perfectly balanced tree (parent pointers set) in O(n)
+        after a single sort; pass presorted=True to skip the sort.
+        Duplicates are dropped, as with insert.
+        """
+        tree = cls(threaded, balanced)
+        tree._rebuild(values if presorted else sorted(values))
+        return tree
+    
+    def bulk_merge(self, values, presorted=False):
+        """Merge a batch of values: linear merge with the in-order sequence, then a balanced rebuild. Time: O(n + m)"""
+        batch = values if presorted else sorted(values)
+        self._rebuild(heapq.merge(self.in_order_traversal(), batch))
+    
+    def _rebuild(self, ordered):
+        nodes = []
+        for value in ordered:
+            if not nodes or value != nodes[-1].value:
+                nodes.append(self._node_class(value))
+        if self.threaded:
+            for left, right in zip(nodes, nodes[1:]):
+                left.next = right
+                right.prev = left
+        self.root = self._build_balanced(nodes, 0, len(nodes), None)
+        self.size = len(nodes)
+        if self.balanced:
+            # Hand out priorities in decreasing order level by level, so
+            # every parent outranks its children (treap heap order)
+            priorities = sorted((random.random() for _ in nodes), reverse=True)
+            level = [self.root] if self.root else []
+            index = 0
+            while level:
+                for node in level:
+                    node.priority = priorities[index]
+                    index += 1
+                level = [child for node in level for child in (node.left, node.right) if child]
+    
+    def _build_balanced(self, nodes, lo, hi, parent):
+        if lo >= hi:
+            return None
+        mid = (lo + hi) // 2
+        node = nodes[mid]
+        node.parent = parent
+        node.left = self._build_balanced(nodes, lo, mid, node)
+        node.right = self._build_balanced(nodes, mid + 1, hi, node)
+        return node
+    
+    def save(self, path):
+        """
+        Write the values as a complete tree in Eytzinger order (see
+        EytzingerTree). Values must be integers that fit in 64 bits.
+        Time: O(n)
+        """
+        order = _eytzinger_in_order(self.size)
+        layout = array('q', [0]) * self.size
+        for slot, node in zip(order, self.iter_nodes()):
+            layout[slot] = node.value
+        with open(path, 'wb') as f:
+            f.write(_TREE_HEADER.pack(_TREE_MAGIC, self.size))
+            f.write(memoryview(layout).cast('B'))
+    
+    @classmethod
+    def load(cls, path, threaded=False, balanced=False):
+        """
+        Rebuild a tree written by save(). Children are linked by array
+        index, so no values are compared: O(n). The result is a complete
+        (perfectly balanced) tree whatever shape was saved.
+        """
+        with open(path, 'rb') as f:
+            magic, count = _TREE_HEADER.unpack(f.read(_TREE_HEADER.size))
+            if magic != _TREE_MAGIC:
+                raise ValueError(f"{path} is not a BST snapshot file")
+            layout = array('q')
+            layout.fromfile(f, count)
+        
+        tree = cls(threaded, balanced)
+        nodes = [tree._node_class(value) for value in layout]
+        for k, node in enumerate(nodes):
+            left, right = 2 * k + 1, 2 * k + 2
+            if left < count:
+                node.left = nodes[left]
+                nodes[left].parent = node
+            if right < count:
+                node.right = nodes[right]
+                nodes[right].parent = node
+        if threaded:
+            ordered = [nodes[slot] for slot in _eytzinger_in_order(count)]
+            for left, right in zip(ordered, ordered[1:]):
+                left.next = right
+                right.prev = left
+        if balanced:
+            # Eytzinger order is level order, so decreasing priorities by
+            # index keep every parent above its children
+            for node, priority in zip(nodes, sorted((random.random() for _ in nodes), reverse=True)):
+                node.priority = priority
+        tree.root = nodes[0] if nodes else None
+        tree.size = count
+        return tree
     
     def insert(self, value):
         """Insert a value into the BST. Time: O(h)"""
-        new_node = TreeNode(value)
-        self.size += 1
-        
         if not self.root:
-            self.root = new_node
-            return new_node
+            self.root = self._new_node(value)
+            self.size = 1
+            return self.root
         
         current = self.root
         while True:
             if value < current.value:
                 if current.left is None:
-                    current.left = new_node
-                    new_node.parent = current
-                    return new_node
+                    new_node = current.left = self._new_node(value)
+                    if self.threaded:
+                        self._link(current.prev, new_node, current)
+                    break
                 current = current.left
             elif value > current.value:
                 if current.right is None:
-                    current.right = new_node
-                    new_node.parent = current
-                    return new_node
+                    new_node = current.right = self._new_node(value)
+                    if self.threaded:
+                        self._link(current, new_node, current.next)
+                    break
                 current = current.right
             else:
                 # Duplicate value - don't insert
-                self.size -= 1
                 return current
+        
+        new_node.parent = current
+        self.size += 1
+        if self.balanced:
+            # Treap: rotate up until the parent's priority is not smaller
+            while new_node.parent and new_node.parent.priority < new_node.priority:
+                self._rotate_up(new_node)
+        return new_node
+    
+    def _new_node(self, value):
+        node = self._node_class(value)
+        if self.balanced:
+            node.priority = random.random()
+        return node
+    
+    def delete(self, value):
+        """
+        Delete a value, keeping parent pointers, size and (in threaded mode)
+        the in-order links correct. Other nodes keep their identity, so
+        node handles held by callers stay valid.
+        Time: O(h); returns False if the value is not stored
+        """
+        node = self.find(value)
+        if not node:
+            return False
+        
+        if self.threaded:
+            if node.prev:
+                node.prev.next = node.next
+            if node.next:
+                node.next.prev = node.prev
+            node.prev = node.next = None
+        
+        if self.balanced:
+            # Treap: rotate the node down below its higher-priority child
+            # until it has at most one child, then splice it out
+            while node.left and node.right:
+                self._rotate_up(node.left if node.left.priority > node.right.priority else node.right)
+            self._transplant(node, node.left or node.right)
+        elif node.left is None:
+            self._transplant(node, node.right)
+        elif node.right is None:
+            self._transplant(node, node.left)
+        else:
+            # Two children: the successor (minimum of right subtree) takes its place
+            successor = self.find_min(node.right)
+            if successor.parent is not node:
+                self._transplant(successor, successor.right)
+                successor.right = node.right
+                successor.right.parent = successor
+            self._transplant(node, successor)
+            successor.left = node.left
+            successor.left.parent = successor
+        
+        node.parent = node.left = node.right = None
+        self.size -= 1
+        return True
+    
+    def _transplant(self, old, new):
+        """Put the subtree rooted at new where old's subtree was"""
+        parent = old.parent
+        if parent is None:
+            self.root = new
+        elif parent.left is old:
+            parent.left = new
+        else:
+            parent.right = new
+        if new:
+            new.parent = parent
+    
+    def _rotate_up(self, node):
+        """Rotate node above its parent, preserving in-order and parent pointers"""
+        parent = node.parent
+        if parent.left is node:
+            parent.left = node.right
+            if node.right:
+                node.right.parent = parent
+            node.right = parent
+        else:
+            parent.right = node.left
+            if node.left:
+                node.left.parent = parent
+            node.left = parent
+        self._transplant(parent, node)
+        parent.parent = node
+    
+    @staticmethod
+    def _link(prev, node, next_node):
+        """Splice node into the in-order list between prev and next_node"""
+        node.prev = prev
+        node.next = next_node
+        if prev:
+            prev.next = node
+        if next_node:
+            next_node.prev = node
     
     def find(self, value):
         """Find a node by value. Time: O(h)"""
@@ -83,26 +317,24 @@ class BinarySearchTree:
             node = node.right
         return node
     
-    def find_successor(self, value):
+    def successor(self, node):
         """
-        Find the successor (next larger value) of a given value.
+        Return the in-order successor node of a node, or None.
         
         Algorithm:
         1. If node has right subtree: successor is minimum of right subtree
         2. Else: traverse up until we find a node that is a left child
            The parent of that node is the successor
         
-        Time Complexity: O(h) where h is the height of the tree
-        
-        Returns: successor value or None if no successor exists
+        Time Complexity: O(h) (O(1) in threaded mode); stepping through all
+        n nodes this way costs O(n) in total either way
         """
-        node = self.find(value)
-        if not node:
-            return None
+        if self.threaded:
+            return node.next
         
         # Case 1: Node has right subtree
         if node.right:
-            return self.find_min(node.right).value
+            return self.find_min(node.right)
         
         # Case 2: No right subtree - go up to find successor
         successor = node.parent
@@ -113,28 +345,25 @@ class BinarySearchTree:
             current = successor
             successor = successor.parent
         
-        return successor.value if successor else None
+        return successor
     
-    def find_predecessor(self, value):
+    def predecessor(self, node):
         """
-        Find the predecessor (previous smaller value) of a given value.
+        Return the in-order predecessor node of a node, or None.
         
         Algorithm:
         1. If node has left subtree: predecessor is maximum of left subtree
         2. Else: traverse up until we find a node that is a right child
            The parent of that node is the predecessor
         
-        Time Complexity: O(h) where h is the height of the tree
-        
-        Returns: predecessor value or None if no predecessor exists
+        Time Complexity: O(h) (O(1) in threaded mode)
         """
-        node = self.find(value)
-        if not node:
-            return None
+        if self.threaded:
+            return node.prev
         
         # Case 1: Node has left subtree
         if node.left:
-            return self.find_max(node.left).value
+            return self.find_max(node.left)
         
         # Case 2: No left subtree - go up to find predecessor
         predecessor = node.parent
@@ -145,32 +374,146 @@ class BinarySearchTree:
             current = predecessor
             predecessor = predecessor.parent
         
+        return predecessor
+    
+    def find_successor(self, value):
+        """
+        Find the successor (next larger value) of a given value.
+        Time Complexity: O(h) - find, then successor()
+        Returns: successor value or None if no successor exists
+        """
+        node = self.find(value)
+        if not node:
+            return None
+        successor = self.successor(node)
+        return successor.value if successor else None
+    
+    def find_predecessor(self, value):
+        """
+        Find the predecessor (previous smaller value) of a given value.
+        Time Complexity: O(h) - find, then predecessor()
+        Returns: predecessor value or None if no predecessor exists
+        """
+        node = self.find(value)
+        if not node:
+            return None
+        predecessor = self.predecessor(node)
         return predecessor.value if predecessor else None
     
+    def _ceiling_node(self, value, strict=False):
+        """Smallest node with node.value >= value (> if strict), or None. Time: O(h)"""
+        best = None
+        current = self.root
+        while current:
+            if current.value > value or (current.value == value and not strict):
+                best = current
+                current = current.left
+            else:
+                current = current.right
+        return best
+    
+    def _floor_node(self, value, strict=False):
+        """Largest node with node.value <= value (< if strict), or None. Time: O(h)"""
+        best = None
+        current = self.root
+        while current:
+            if current.value < value or (current.value == value and not strict):
+                best = current
+                current = current.right
+            else:
+                current = current.left
+        return best
+    
+    def ceiling(self, value):
+        """Smallest stored value >= value (value need not be in the tree). Time: O(h)"""
+        node = self._ceiling_node(value)
+        return node.value if node else None
+    
+    def floor(self, value):
+        """Largest stored value <= value. Time: O(h)"""
+        node = self._floor_node(value)
+        return node.value if node else None
+    
+    def higher(self, value):
+        """Smallest stored value > value. Time: O(h)"""
+        node = self._ceiling_node(value, strict=True)
+        return node.value if node else None
+    
+    def lower(self, value):
+        """Largest stored value < value. Time: O(h)"""
+        node = self._floor_node(value, strict=True)
+        return node.value if node else None
+    
+    def range(self, lo, hi):
+        """Lazily yield stored values in [lo, hi] in ascending order. Time: O(h + k)"""
+        node = self._ceiling_node(lo)
+        while node and node.value <= hi:
+            yield node.value
+            node = self.successor(node)
+    
+    def ceiling_many(self, probes):
+        """
+        ceiling() for many probes in one merged pass: a single descent for
+        the smallest probe, then successor steps shared by all probes.
+        Unsorted probes are sorted first; results follow the input order.
+        Time: O(h + m + k) for m sorted probes spanning k stored values
+        """
+        order = self._probe_order(probes)
+        results = [None] * len(probes)
+        if not order:
+            return results
+        node = self._ceiling_node(probes[order[0]])
+        for i in order:
+            while node and node.value < probes[i]:
+                node = self.successor(node)
+            results[i] = node.value if node else None
+        return results
+    
+    def floor_many(self, probes):
+        """floor() for many probes in one merged pass; see ceiling_many"""
+        order = self._probe_order(probes)
+        results = [None] * len(probes)
+        if not order:
+            return results
+        floor = self._floor_node(probes[order[0]])
+        ahead = self.successor(floor) if floor else self.find_min(self.root)
+        for i in order:
+            while ahead and ahead.value <= probes[i]:
+                floor, ahead = ahead, self.successor(ahead)
+            results[i] = floor.value if floor else None
+        return results
+    
+    @staticmethod
+    def _probe_order(probes):
+        """Indices of probes in ascending probe order (identity if already sorted)"""
+        if all(a <= b for a, b in zip(probes, probes[1:])):
+            return list(range(len(probes)))
+        return sorted(range(len(probes)), key=probes.__getitem__)
+    
+    def iter_nodes(self, reverse=False):
+        """Yield nodes in ascending (or descending) order by successor stepping. Time: O(n) total"""
+        if reverse:
+            node, step = self.find_max(self.root), self.predecessor
+        else:
+            node, step = self.find_min(self.root), self.successor
+        while node:
+            yield node
+            node = step(node)
+    
     def in_order_traversal(self):
-        """Return sorted list of all values. Time: O(n)"""
-        result = []
-        
-        def traverse(node):
-            if node:
-                traverse(node.left)
-                result.append(node.value)
-                traverse(node.right)
-        
-        traverse(self.root)
-        return result
+        """Return sorted list of all values (no recursion, safe on deep trees). Time: O(n)"""
+        return [node.value for node in self.iter_nodes()]
     
     def get_height(self, node=None):
-        """Get height of tree/subtree. Time: O(n)"""
+        """Get height of tree/subtree, level by level. Time: O(n)"""
         if node is None:
             node = self.root
-        if node is None:
-            return -1
-        
-        left_height = self.get_height(node.left) if node.left else -1
-        right_height = self.get_height(node.right) if node.right else -1
-        
-        return 1 + max(left_height, right_height)
+        height = -1
+        level = [node] if node else []
+        while level:
+            height += 1
+            level = [child for n in level for child in (n.left, n.right) if child]
+        return height
     
     def print_tree(self, node=None, level=0, prefix="Root: "):
         """Print tree structure visually"""
@@ -194,6 +537,714 @@ class BinarySearchTree:
                 print(" " * ((level + 1) * 4) + "R--- None")
 
 
+class ArenaBinarySearchTree:
+    """
+    Array-backed BST with the same operations as BinarySearchTree.
+    
+    Nodes are integer indices into parallel typed arrays (value, left,
+    right, parent) instead of objects, so a node costs 8 + 3 * 4 bytes
+    and neighbouring nodes sit next to each other in memory. Values must
+    be integers that fit in 64 bits; NIL (-1) marks a missing link.
+    """
+    
+    def __init__(self):
+        self.values = array('q')
+        self.left = array('i')
+        self.right = array('i')
+        self.parent = array('i')
+        self.root = NIL
+        self.size = 0
+    
+    def insert(self, value):
+        """Insert a value; returns its node index. Time: O(h)"""
+        values, left, right = self.values, self.left, self.right
+        parent = NIL
+        current = self.root
+        while current != NIL:
+            if value == values[current]:
+                return current  # Duplicate value - don't insert
+            parent = current
+            current = left[current] if value < values[current] else right[current]
+        
+        node = len(values)
+        values.append(value)
+        left.append(NIL)
+        right.append(NIL)
+        self.parent.append(parent)
+        self.size += 1
+        
+        if parent == NIL:
+            self.root = node
+        elif value < values[parent]:
+            left[parent] = node
+        else:
+            right[parent] = node
+        return node
+    
+    def find(self, value):
+        """Find a node index by value (NIL if absent). Time: O(h)"""
+        values, left, right = self.values, self.left, self.right
+        current = self.root
+        while current != NIL:
+            if value == values[current]:
+                return current
+            current = left[current] if value < values[current] else right[current]
+        return NIL
+    
+    def find_min(self, node):
+        """Find minimum node in subtree. Time: O(h)"""
+        if node == NIL:
+            return NIL
+        while self.left[node] != NIL:
+            node = self.left[node]
+        return node
+    
+    def find_max(self, node):
+        """Find maximum node in subtree. Time: O(h)"""
+        if node == NIL:
+            return NIL
+        while self.right[node] != NIL:
+            node = self.right[node]
+        return node
+    
+    def find_successor(self, value):
+        """Successor value of a stored value, or None. Time: O(h)"""
+        node = self.find(value)
+        if node == NIL:
+            return None
+        if self.right[node] != NIL:
+            return self.values[self.find_min(self.right[node])]
+        
+        parent = self.parent
+        successor = parent[node]
+        while successor != NIL and node == self.right[successor]:
+            node = successor
+            successor = parent[successor]
+        return self.values[successor] if successor != NIL else None
+    
+    def find_predecessor(self, value):
+        """Predecessor value of a stored value, or None. Time: O(h)"""
+        node = self.find(value)
+        if node == NIL:
+            return None
+        if self.left[node] != NIL:
+            return self.values[self.find_max(self.left[node])]
+        
+        parent = self.parent
+        predecessor = parent[node]
+        while predecessor != NIL and node == self.left[predecessor]:
+            node = predecessor
+            predecessor = parent[predecessor]
+        return self.values[predecessor] if predecessor != NIL else None
+    
+    def in_order_traversal(self):
+        """Return sorted list of all values (iterative). Time: O(n)"""
+        values, left, right = self.values, self.left, self.right
+        result = []
+        stack = []
+        node = self.root
+        while stack or node != NIL:
+            while node != NIL:
+                stack.append(node)
+                node = left[node]
+            node = stack.pop()
+            result.append(values[node])
+            node = right[node]
+        return result
+    
+    def get_height(self):
+        """Get height of tree (-1 if empty). Time: O(n)"""
+        height = -1
+        level = [self.root] if self.root != NIL else []
+        while level:
+            height += 1
+            level = [child for node in level for child in (self.left[node], self.right[node]) if child != NIL]
+        return height
+
+
+def _eytzinger_in_order(n):
+    """Slots of an n-element Eytzinger layout in in-order (ascending) order"""
+    order = array('q')
+    stack = []
+    k = 0
+    while stack or k < n:
+        while k < n:
+            stack.append(k)
+            k = 2 * k + 1
+        k = stack.pop()
+        order.append(k)
+        k = 2 * k + 2
+    return order
+
+
+class EytzingerTree:
+    """
+    Read-only BST over a snapshot file, memory-mapped and never parsed.
+    
+    The values sit in Eytzinger order: the root at index 0 and the
+    children of k at 2k + 1 and 2k + 2. A search is a chain of index
+    arithmetic with no pointers, and the top levels of every search share
+    the first few cache lines. Opening is O(1) and processes that map the
+    same file share its pages.
+    
+    Every descent goes right when the probe passes the slot value. The
+    answer is the last slot where it went the other way, recovered from the
+    1-based final index by dropping trailing 1 bits (last left turn) or
+    trailing 0 bits (last right turn), plus the bit above them.
+    """
+    
+    def __init__(self, values, mapped=None):
+        self.values = values
+        self.size = len(values)
+        self.mapped = mapped  # keep the mapping alive as long as the view
+    
+    @classmethod
+    def open(cls, path):
+        """Memory-map a file written by BinarySearchTree.save()"""
+        with open(path, 'rb') as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count = _TREE_HEADER.unpack_from(mapped)
+        if magic != _TREE_MAGIC:
+            mapped.close()
+            raise ValueError(f"{path} is not a BST snapshot file")
+        view = memoryview(mapped)[_TREE_HEADER.size:_TREE_HEADER.size + 8 * count].cast('q')
+        return cls(view, mapped)
+    
+    def close(self):
+        self.values.release()
+        if self.mapped is not None:
+            self.mapped.close()
+    
+    def __len__(self):
+        return self.size
+    
+    def find(self, value):
+        """Slot index of value, or NIL if not stored (like ArenaBinarySearchTree). Time: O(log n)"""
+        values, n = self.values, self.size
+        k = 0
+        while k < n:
+            current = values[k]
+            if current == value:
+                return k
+            k = 2 * k + 1 + (current < value)
+        return NIL
+    
+    def _descend(self, value, strict):
+        """1-based final index after going right on values < value (<= if strict)"""
+        values, n = self.values, self.size
+        k = 0
+        if strict:
+            while k < n:
+                k = 2 * k + 1 + (values[k] <= value)
+        else:
+            while k < n:
+                k = 2 * k + 1 + (values[k] < value)
+        return k + 1
+    
+    def _last_left(self, j):
+        j >>= (j ^ (j + 1)).bit_length()
+        return self.values[j - 1] if j else None
+    
+    def _last_right(self, j):
+        j >>= (j & -j).bit_length()
+        return self.values[j - 1] if j else None
+    
+    def find_successor(self, value):
+        """Successor of a stored value, or None (also when value is not stored). Time: O(log n)"""
+        if self.find(value) == NIL:
+            return None
+        return self.higher(value)
+    
+    def find_predecessor(self, value):
+        """Predecessor of a stored value, or None (also when value is not stored). Time: O(log n)"""
+        if self.find(value) == NIL:
+            return None
+        return self.lower(value)
+    
+    def higher(self, value):
+        """Smallest stored value > value (value need not be stored). Time: O(log n)"""
+        return self._last_left(self._descend(value, strict=True))
+    
+    def lower(self, value):
+        """Largest stored value < value. Time: O(log n)"""
+        return self._last_right(self._descend(value, strict=False))
+    
+    def ceiling(self, value):
+        """Smallest stored value >= value. Time: O(log n)"""
+        return self._last_left(self._descend(value, strict=False))
+    
+    def floor(self, value):
+        """Largest stored value <= value. Time: O(log n)"""
+        return self._last_right(self._descend(value, strict=True))
+    
+    def in_order_traversal(self):
+        """Sorted list of all values. Time: O(n)"""
+        values = self.values
+        return [values[slot] for slot in _eytzinger_in_order(self.size)]
+
+
+class PersistentNode:
+    """Immutable treap node: never modified after construction, so it can be shared between snapshots"""
+    __slots__ = ("key", "value", "left", "right", "priority")
+    
+    def __init__(self, key, value, left, right, priority):
+        self.key = key
+        self.value = value
+        self.left = left
+        self.right = right
+        self.priority = priority
+    
+    def __repr__(self):
+        return f"PersistentNode({self.key!r}: {self.value!r})"
+
+
+class ConcurrentOrderedMap:
+    """
+    Ordered key -> value map for many reader threads and a few writers.
+    
+    The tree is a persistent treap: a write copies only the O(log n) nodes
+    on the path it changes and publishes the new root with one attribute
+    assignment, which is atomic. Readers take no lock; each operation
+    reads the current (root, size) snapshot once and works on nodes that
+    are never mutated, so a read sees a consistent tree even while
+    writers run. Writers are serialized by a lock.
+    """
+    
+    def __init__(self, items=()):
+        self._write_lock = threading.Lock()
+        self._snapshot = (None, 0)  # (root, size), replaced as a whole
+        self._read_only = False
+        for key, value in items:
+            self.insert(key, value)
+    
+    def __len__(self):
+        return self._snapshot[1]
+    
+    def __contains__(self, key):
+        return self._find_node(self._snapshot[0], key) is not None
+    
+    def snapshot(self):
+        """
+        Frozen read-only view of the current tree. Later writes do not
+        change it, so a caller can make several related reads against one
+        consistent state. insert and delete on the view raise TypeError.
+        """
+        view = ConcurrentOrderedMap()
+        view._snapshot = self._snapshot
+        view._read_only = True
+        return view
+    
+    # ---- writers: serialized, path copying ----
+    
+    def insert(self, key, value=None):
+        """Insert or replace key. Returns True if the key was new. Time: O(log n) expected"""
+        if self._read_only:
+            raise TypeError("cannot insert into a snapshot view")
+        with self._write_lock:
+            root, size = self._snapshot
+            root, added = self._insert(root, key, value, random.random())
+            self._snapshot = (root, size + added)
+        return added
+    
+    def delete(self, key):
+        """Remove key. Returns False if it was not stored. Time: O(log n) expected"""
+        if self._read_only:
+            raise TypeError("cannot delete from a snapshot view")
+        with self._write_lock:
+            root, size = self._snapshot
+            if self._find_node(root, key) is None:
+                return False
+            self._snapshot = (self._delete(root, key), size - 1)
+        return True
+    
+    def _insert(self, node, key, value, priority):
+        """Return (copy of node's subtree with key set, whether key was new)"""
+        if node is None:
+            return PersistentNode(key, value, None, None, priority), True
+        if key < node.key:
+            left, added = self._insert(node.left, key, value, priority)
+            if left.priority > node.priority:
+                # Rotate right: the fresh left copy becomes the subtree root
+                lowered = PersistentNode(node.key, node.value, left.right, node.right, node.priority)
+                return PersistentNode(left.key, left.value, left.left, lowered, left.priority), added
+            return PersistentNode(node.key, node.value, left, node.right, node.priority), added
+        if key > node.key:
+            right, added = self._insert(node.right, key, value, priority)
+            if right.priority > node.priority:
+                lowered = PersistentNode(node.key, node.value, node.left, right.left, node.priority)
+                return PersistentNode(right.key, right.value, lowered, right.right, right.priority), added
+            return PersistentNode(node.key, node.value, node.left, right, node.priority), added
+        return PersistentNode(key, value, node.left, node.right, node.priority), False
+    
+    def _delete(self, node, key):
+        """Return a copy of node's subtree without key (key must be present)"""
+        if key < node.key:
+            return PersistentNode(node.key, node.value, self._delete(node.left, key), node.right, node.priority)
+        if key > node.key:
+            return PersistentNode(node.key, node.value, node.left, self._delete(node.right, key), node.priority)
+        return self._merge(node.left, node.right)
+    
+    def _merge(self, left, right):
+        """Join two treaps where every key in left < every key in right, copying the merged spine"""
+        if left is None:
+            return right
+        if right is None:
+            return left
+        if left.priority > right.priority:
+            return PersistentNode(left.key, left.value, left.left, self._merge(left.right, right), left.priority)
+        return PersistentNode(right.key, right.value, self._merge(left, right.left), right.right, right.priority)
+    
+    # ---- readers: lock-free, one snapshot per call ----
+    
+    @staticmethod
+    def _find_node(node, key):
+        while node:
+            if key == node.key:
+                return node
+            node = node.left if key < node.key else node.right
+        return None
+    
+    def find(self, key, default=None):
+        """Value stored for key, or default. Time: O(log n) expected"""
+        node = self._find_node(self._snapshot[0], key)
+        return node.value if node else default
+    
+    @staticmethod
+    def _ceiling_node(node, key, strict=False):
+        best = None
+        while node:
+            if node.key > key or (node.key == key and not strict):
+                best = node
+                node = node.left
+            else:
+                node = node.right
+        return best
+    
+    @staticmethod
+    def _floor_node(node, key, strict=False):
+        best = None
+        while node:
+            if node.key < key or (node.key == key and not strict):
+                best = node
+                node = node.right
+            else:
+                node = node.left
+        return best
+    
+    def find_successor(self, key):
+        """Successor of a stored key, or None (also when key is not stored). Time: O(log n) expected"""
+        root = self._snapshot[0]
+        if self._find_node(root, key) is None:
+            return None
+        node = self._ceiling_node(root, key, strict=True)
+        return node.key if node else None
+    
+    def find_predecessor(self, key):
+        """Predecessor of a stored key, or None (also when key is not stored). Time: O(log n) expected"""
+        root = self._snapshot[0]
+        if self._find_node(root, key) is None:
+            return None
+        node = self._floor_node(root, key, strict=True)
+        return node.key if node else None
+    
+    def higher(self, key):
+        """Smallest stored key > key (key need not be stored). Time: O(log n) expected"""
+        node = self._ceiling_node(self._snapshot[0], key, strict=True)
+        return node.key if node else None
+    
+    def lower(self, key):
+        """Largest stored key < key"""
+        node = self._floor_node(self._snapshot[0], key, strict=True)
+        return node.key if node else None
+    
+    def ceiling(self, key):
+        """Smallest stored key >= key"""
+        node = self._ceiling_node(self._snapshot[0], key)
+        return node.key if node else None
+    
+    def floor(self, key):
+        """Largest stored key <= key"""
+        node = self._floor_node(self._snapshot[0], key)
+        return node.key if node else None
+    
+    def range(self, lo, hi):
+        """
+        Lazily yield (key, value) for lo <= key <= hi in ascending order,
+        all from the snapshot current when iteration started, even if
+        writers publish new roots meanwhile. Time: O(log n + k)
+        """
+        stack = []
+        node = self._snapshot[0]
+        while True:
+            # Descend left, skipping subtrees that lie entirely below lo
+            while node:
+                if node.key < lo:
+                    node = node.right
+                else:
+                    stack.append(node)
+                    node = node.left
+            if not stack:
+                return
+            node = stack.pop()
+            if node.key > hi:
+                return
+            yield node.key, node.value
+            node = node.right
+    
+    def items(self):
+        """All (key, value) pairs of one snapshot in ascending key order"""
+        node = self._snapshot[0]
+        stack = []
+        result = []
+        while stack or node:
+            while node:
+                stack.append(node)
+                node = node.left
+            node = stack.pop()
+            result.append((node.key, node.value))
+            node = node.right
+        return result
+    
+    def in_order_traversal(self):
+        """Sorted list of keys from one snapshot. Time: O(n)"""
+        return [key for key, _ in self.items()]
+    
+    def get_height(self):
+        """Height of the current snapshot, level by level. Time: O(n)"""
+        height = -1
+        level = [self._snapshot[0]] if self._snapshot[0] else []
+        while level:
+            height += 1
+            level = [child for n in level for child in (n.left, n.right) if child]
+        return height
+
+
+def benchmark_node_storage(n=1_000_000, seed=42):
+    """Bytes per node and in-order traversal time: __slots__ nodes vs arena arrays"""
+    keys = random.Random(seed).sample(range(n * 10), n)
+    results = {}
+    print(f"\nNode storage benchmark, {n:,} random keys")
+    for name, factory in (("slots", BinarySearchTree), ("arena", ArenaBinarySearchTree)):
+        tracemalloc.start()
+        tree = factory()
+        for key in keys:
+            tree.insert(key)
+        memory = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        start = time.perf_counter()
+        tree.in_order_traversal()
+        traversal = time.perf_counter() - start
+        results[name] = {"bytes_per_node": memory / n, "traversal": traversal}
+        print(f"  {name:<6} {memory / n:6.1f} bytes/node   in-order traversal {traversal:.2f}s")
+        del tree
+    return results
+
+
+def benchmark_bulk_load(n=1_000_000, seed=42):
+    """Build time: repeated insert vs from_iterable vs bulk_merge"""
+    keys = random.Random(seed).sample(range(n * 10), n)
+    sorted_keys = sorted(keys)
+    
+    def insert_loop():
+        tree = BinarySearchTree()
+        for key in keys:
+            tree.insert(key)
+    
+    cases = [
+        ("insert loop (random)", insert_loop),
+        ("from_iterable (random)", lambda: BinarySearchTree.from_iterable(keys)),
+        ("from_iterable (presorted)", lambda: BinarySearchTree.from_iterable(sorted_keys, presorted=True)),
+        ("bulk_merge (n/2 + n/2)", lambda: BinarySearchTree.from_iterable(keys[:n // 2]).bulk_merge(keys[n // 2:])),
+    ]
+    results = {}
+    print(f"\nBulk build benchmark, n = {n:,}")
+    for name, build in cases:
+        start = time.perf_counter()
+        build()
+        results[name] = time.perf_counter() - start
+        print(f"  {name:<27} {results[name]:6.2f}s")
+    return results
+
+
+def benchmark_snapshot(n=1_000_000, probes=200_000, seed=42, path="lab6_tree.bin"):
+    """
+    Process start-up cost: insert loop vs load() of a saved snapshot vs
+    mapping it as an EytzingerTree, then query throughput on the loaded
+    tree and on the mapped array: higher() on arbitrary probes and
+    find_successor() on stored keys.
+    """
+    rng = random.Random(seed)
+    keys = rng.sample(range(n * 10), n)
+    queries = [rng.randrange(n * 10) for _ in range(probes)]
+    stored = rng.sample(keys, min(probes, n))
+    results = {}
+    print(f"\nSnapshot benchmark, n = {n:,}")
+    
+    start = time.perf_counter()
+    tree = BinarySearchTree()
+    for key in keys:
+        tree.insert(key)
+    results["insert loop"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    tree.save(path)
+    results["save"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    loaded = BinarySearchTree.load(path)
+    results["load"] = time.perf_counter() - start
+    
+    start = time.perf_counter()
+    mapped = EytzingerTree.open(path)
+    results["mmap open"] = time.perf_counter() - start
+    
+    for name, seconds in results.items():
+        print(f"  {name:<12} {seconds * 1000:10.2f} ms")
+    print(f"  file size    {8 * n / 2**20:10.1f} MiB (8 bytes/value + {_TREE_HEADER.size}-byte header)")
+    
+    for name, index in (("load()ed tree", loaded), ("Eytzinger mmap", mapped)):
+        for method, probe_keys in (("higher", queries), ("find_successor", stored)):
+            query = getattr(index, method)
+            start = time.perf_counter()
+            for q in probe_keys:
+                query(q)
+            elapsed = time.perf_counter() - start
+            results[f"{name} {method}"] = elapsed
+            print(f"  {name:<15} {method:<15} {len(probe_keys) / elapsed:10,.0f} lookups/s")
+    
+    mapped.close()
+    os.remove(path)
+    return results
+
+
+def benchmark_churn(operations=10_000_000, live_keys=100_000, seed=42, plain_sliding_limit=2_000):
+    """
+    Mixed insert/delete/find churn (40/40/20) on plain vs treap trees.
+    "random" draws keys uniformly; "sliding" inserts increasing keys and
+    deletes the oldest, the pattern that degrades a plain BST to a list,
+    so that case is skipped above plain_sliding_limit live keys.
+    """
+    results = {}
+    print(f"\nChurn benchmark: {operations:,} mixed operations, ~{live_keys:,} live keys")
+    for workload in ("random", "sliding"):
+        for balanced in (False, True):
+            if workload == "sliding" and not balanced and live_keys > plain_sliding_limit:
+                print(f"  sliding/plain  skipped (O(n) per operation at {live_keys:,} live keys)")
+                continue
+            rng = random.Random(seed)
+            tree = BinarySearchTree(balanced=balanced)
+            next_key = oldest = 0
+            for _ in range(live_keys):
+                tree.insert(rng.randrange(live_keys * 4) if workload == "random" else next_key)
+                next_key += 1
+            
+            start = time.perf_counter()
+            for _ in range(operations):
+                op = rng.random()
+                if workload == "random":
+                    key = rng.randrange(live_keys * 4)
+                    if op < 0.4:
+                        tree.insert(key)
+                    elif op < 0.8:
+                        tree.delete(key)
+                    else:
+                        tree.find(key)
+                elif op < 0.4:
+                    tree.insert(next_key)
+                    next_key += 1
+                elif op < 0.8:
+                    tree.delete(oldest)
+                    oldest += 1
+                else:
+                    tree.find(rng.randrange(oldest, next_key))
+            elapsed = time.perf_counter() - start
+            
+            label = f"{workload}/{'treap' if balanced else 'plain'}"
+            results[label] = {"seconds": elapsed, "height": tree.get_height(), "size": tree.size}
+            print(f"  {label:<14} {elapsed:7.2f}s  {operations / elapsed:10,.0f} ops/s  "
+                  f"final size {tree.size:,}, height {results[label]['height']}")
+    return results
+
+
+def benchmark_concurrent_reads(keys=100_000, readers=4, writer_counts=(0, 1, 2, 4), duration=1.0, seed=42):
+    """
+    Read throughput (find + higher + short range) with a fixed
+    pool of reader threads while 0..N writer threads insert and delete.
+    Compares lock-free snapshot reads on ConcurrentOrderedMap with a
+    treap BinarySearchTree behind one global lock.
+    """
+    initial = random.Random(seed).sample(range(keys * 4), keys)
+    
+    def cow_factory():
+        tree = ConcurrentOrderedMap()
+        for key in initial:
+            tree.insert(key)
+        
+        def read(key):
+            tree.find(key)
+            tree.higher(key)
+            return sum(1 for _ in tree.range(key, key + 40))
+        return read, tree.insert, tree.delete
+    
+    def locked_factory():
+        tree = BinarySearchTree.from_iterable(initial, balanced=True)
+        lock = threading.Lock()
+        
+        def read(key):
+            with lock:
+                tree.find(key)
+                tree.higher(key)
+                return sum(1 for _ in tree.range(key, key + 40))
+        
+        def insert(key):
+            with lock:
+                tree.insert(key)
+        
+        def delete(key):
+            with lock:
+                tree.delete(key)
+        return read, insert, delete
+    
+    results = {}
+    print(f"\nConcurrent read benchmark: {keys:,} keys, {readers} readers, {duration:.1f}s per case")
+    for name, factory in (("copy-on-write", cow_factory), ("global lock", locked_factory)):
+        read, insert, delete = factory()
+        for writers in writer_counts:
+            stop = threading.Event()
+            reads = [0] * readers
+            writes = [0] * writers
+            
+            def reader(slot):
+                rng = random.Random(seed + slot)
+                while not stop.is_set():
+                    read(rng.randrange(keys * 4))
+                    reads[slot] += 1
+            
+            def writer(slot):
+                rng = random.Random(-seed - slot)
+                while not stop.is_set():
+                    key = rng.randrange(keys * 4)
+                    if rng.random() < 0.5:
+                        insert(key)
+                    else:
+                        delete(key)
+                    writes[slot] += 1
+            
+            threads = [threading.Thread(target=reader, args=(i,)) for i in range(readers)]
+            threads += [threading.Thread(target=writer, args=(i,)) for i in range(writers)]
+            for thread in threads:
+                thread.start()
+            time.sleep(duration)
+            stop.set()
+            for thread in threads:
+                thread.join()
+            
+            results[(name, writers)] = {"reads_per_s": sum(reads) / duration, "writes_per_s": sum(writes) / duration}
+            print(f"  {name:<14} {writers} writers: {sum(reads) / duration:10,.0f} reads/s  "
+                  f"{sum(writes) / duration:10,.0f} writes/s")
+    return results
+
+
 def demonstrate_successor_predecessor():
     """Main demonstration of successor/predecessor algorithms"""
     
@@ -285,20 +1336,42 @@ def demonstrate_successor_predecessor():
     print(f"   - Predecessor of minimum ({min_val}): {bst.find_predecessor(min_val)}")
     print(f"   - Successor of maximum ({max_val}): {bst.find_successor(max_val)}")
     print(f"   - Successor of non-existent (100): {bst.find_successor(100)}")
+    print(f"   - Ceiling / floor of non-existent 52: {bst.ceiling(52)} / {bst.floor(52)}")
+    print(f"   - Higher / lower than 100: {bst.higher(100)} / {bst.lower(100)}")
+    print(f"   - Values in [33, 62]: {list(bst.range(33, 62))}")
+    print(f"   - Ceilings of [1, 41, 66, 99] in one pass: {bst.ceiling_many([1, 41, 66, 99])}")
+    
+    # Deletion
+    churned = BinarySearchTree.from_iterable(values, balanced=True)
+    for v in (30, 50, 85):
+        churned.delete(v)
+    print(f"   - After deleting 30, 50, 85 (treap): {churned.in_order_traversal()}, "
+          f"successor of 25 is {churned.find_successor(25)}, size {churned.size}")
+    
+    # Copy-on-write map: a snapshot is unaffected by later writes
+    ordered_map = ConcurrentOrderedMap((v, f"v{v}") for v in values)
+    frozen = ordered_map.snapshot()
+    ordered_map.delete(50)
+    ordered_map.insert(52, "v52")
+    print(f"   - Concurrent map after delete 50 / insert 52: keys in [45, 60] = "
+          f"{[k for k, _ in ordered_map.range(45, 60)]}, snapshot still has "
+          f"{[k for k, _ in frozen.range(45, 60)]}")
     
     # Verification
     print("\n8. Verification (Successor chain from min to max):")
     print("-" * 50)
     
-    chain = []
-    current = min_val
-    while current is not None:
-        chain.append(current)
-        current = bst.find_successor(current)
+    # Step node to node instead of find_successor(value), which would
+    # repeat an O(h) search for every value
+    chain = [node.value for node in bst.iter_nodes()]
     
     print(f"   Chain: {' → '.join(map(str, chain))}")
     print(f"   Matches sorted order: {chain == sorted_values}")
     
+    threaded = BinarySearchTree.from_iterable(values, threaded=True)
+    descending = [node.value for node in threaded.iter_nodes(reverse=True)]
+    print(f"   Threaded tree, descending via prev links: {descending == sorted_values[::-1]}")
+    
     print("\n" + "=" * 60)
     print("Lab 6 Complete!")
     print("=" * 60)
@@ -3,15 +3,55 @@ Lab 7: Hash Tables and Collision Handling
 =========================================
 Implementation of a hash table using chaining method for collision resolution.
 Hash function: sum of cubes of ASCII codes modulo table size.
+The table grows when the load factor passes a threshold, moving a few
+buckets per operation (incremental rehash) instead of all at once.
+OpenAddressingHashTable offers the same API with Robin Hood linear
+probing over flat arrays instead of chains, and ConcurrentHashTable is a
+lock-striped variant that can be shared between threads.
 """
 
+import gc
+import random
+import string
+import threading
+import time
+import tracemalloc
+
+
+# Cubes of every code point that fits in one latin-1 byte
+_CUBES = tuple(code ** 3 for code in range(256))
+
+
+def _cube_sum(key: str) -> int:
+    """
+    Σ ASCII(char)³ before the modulo, shared by every table in this lab.
+    Keys that encode to latin-1 (one byte per char, same code points) are
+    summed with C-level table lookups over the bytes; wider characters
+    fall back to pow().
+    """
+    try:
+        return sum(map(_CUBES.__getitem__, key.encode("latin-1")))
+    except UnicodeEncodeError:
+        return sum(ord(char) ** 3 for char in key)
+
+
+def _next_prime(n: int) -> int:
+    """Smallest prime >= n"""
+    n = max(n, 2)
+    while any(n % d == 0 for d in range(2, int(n ** 0.5) + 1)):
+        n += 1
+    return n
+
 
 class HashNode:
     """Node for the linked list in chaining"""
 
-    def __init__(self, key: str, value: str):
+    def __init__(self, key: str, value: str, key_hash: int | None = None):
         self.key = key
         self.value = value
+        # Σ ASCII³ of key (before the modulo), so rehashing never recomputes
+        # it and chain walks compare ints before strings
+        self.key_hash = _cube_sum(key) if key_hash is None else key_hash
         self.next = None
 
     def __repr__(self):
@@ -19,23 +59,56 @@ class HashNode:
 
 
 class HashTable:
-    """Hash Table with chaining collision resolution"""
+    """
+    Hash Table with chaining collision resolution.
+
+    When count / size would exceed max_load_factor (None disables growth)
+    the capacity roughly doubles: to the next prime with
+    capacity_policy="prime", or to the next power of two with "pow2"
+    (index = sum & (size - 1)). The old buckets are then drained
+    rehash_step at a time on every insert/search/delete, so no single
+    operation pays for moving the whole table; rehash_step=None rehashes
+    everything at once. A key's own old bucket is always moved before it
+    is touched, so each key lives in exactly one place.
 
-    def __init__(self, size: int = 11):
+    insert() and search() return diagnostic dicts (bucket, collision,
+    steps) for demonstrations. The mapping interface (ht[key] = value,
+    ht[key], del ht[key], key in ht, get, items) and the batch
+    insert_many/get_many allocate no per-call results.
+    """
+
+    def __init__(self, size: int = 11, max_load_factor: float | None = 0.75,
+                 capacity_policy: str = "prime", rehash_step: int | None = 2,
+                 cube_sum=_cube_sum):
+        if capacity_policy not in ("prime", "pow2"):
+            raise ValueError(f"unknown capacity policy: {capacity_policy!r}")
+        if capacity_policy == "pow2":
+            size = 1 << max(size - 1, 0).bit_length()
         self.size = size
         self.buckets = [None] * size
         self.count = 0
+        self.max_load_factor = max_load_factor
+        self.capacity_policy = capacity_policy
+        self.rehash_step = rehash_step
+        self.resizes = 0
+        # Σ ASCII³ implementation; benchmarks pass a reference version
+        self._cube_sum = cube_sum
+        # Incremental rehash state: buckets below _rehash_index are drained
+        self._old_buckets = None
+        self._old_size = 0
+        self._rehash_index = 0
+
+    def _index(self, total: int, size: int) -> int:
+        if self.capacity_policy == "pow2":
+            return total & (size - 1)
+        return total % size
 
     def hash(self, key: str) -> int:
         """
         Hash function: sum of cubes of ASCII codes modulo table size
         h(key) = (Σ ASCII(char)³) mod size
         """
-        total = 0
-        for char in key:
-            ascii_code = ord(char)
-            total += ascii_code ** 3  # Cube of ASCII code
-        return total % self.size
+        return self._index(self._cube_sum(key), self.size)
 
     def hash_detailed(self, key: str) -> dict:
         """Calculate hash with detailed steps for demonstration"""
@@ -47,44 +120,114 @@ class HashTable:
             total += cube
             steps.append({"char": char, "ascii": ascii_code, "cube": cube})
 
-        return {"key": key, "steps": steps, "sum": total, "index": total % self.size}
+        return {"key": key, "steps": steps, "sum": total, "index": self._index(total, self.size)}
 
-    def insert(self, key: str, value: str) -> dict:
-        """Insert a key-value pair into the hash table"""
-        index = self.hash(key)
-        is_collision = self.buckets[index] is not None
+    def _grown_size(self) -> int:
+        if self.capacity_policy == "pow2":
+            return self.size * 2
+        return _next_prime(self.size * 2 + 1)
+
+    def _capacity_for(self, count: int) -> int:
+        """Smallest size allowed by the capacity policy that keeps count keys under the threshold"""
+        needed = int(count / self.max_load_factor) + 1
+        if self.capacity_policy == "pow2":
+            return 1 << (needed - 1).bit_length()
+        return _next_prime(needed)
+
+    def _start_rehash(self, new_size: int | None = None):
+        """Allocate the larger table; existing chains move over lazily"""
+        self._finish_rehash()
+        self._old_buckets, self._old_size = self.buckets, self.size
+        self.size = new_size or self._grown_size()
+        self.buckets = [None] * self.size
+        self._rehash_index = 0
+        self.resizes += 1
+        if self.rehash_step is None:
+            self._finish_rehash()
+
+    def _migrate_bucket(self, old_index: int):
+        """Move one old chain into the new table"""
+        node = self._old_buckets[old_index]
+        self._old_buckets[old_index] = None
+        while node:
+            next_node = node.next
+            index = self._index(node.key_hash, self.size)
+            node.next = self.buckets[index]
+            self.buckets[index] = node
+            node = next_node
+
+    def _rehash_some(self, steps: int):
+        """Drain up to steps non-empty old buckets, visiting at most 10x as many empty ones"""
+        old = self._old_buckets
+        visits = steps * 10
+        while steps and visits and self._rehash_index < self._old_size:
+            if old[self._rehash_index] is not None:
+                self._migrate_bucket(self._rehash_index)
+                steps -= 1
+            self._rehash_index += 1
+            visits -= 1
+        if self._rehash_index >= self._old_size:
+            self._old_buckets = None
+            self._old_size = 0
+
+    def _finish_rehash(self):
+        while self._old_buckets is not None:
+            self._rehash_some(self._old_size)
+
+    def _locate(self, key: str) -> tuple:
+        """(bucket in the current table, cube sum) for key, advancing any rehash in progress"""
+        total = self._cube_sum(key)
+        if self._old_buckets is not None:
+            old_index = self._index(total, self._old_size)
+            if self._old_buckets[old_index] is not None:
+                self._migrate_bucket(old_index)
+            self._rehash_some(self.rehash_step)
+        return self._index(total, self.size), total
+
+    def _set(self, key: str, value: str) -> tuple:
+        """
+        Insert or update key; shared by insert() and ht[key] = value.
+        Returns (index, collision, updated, old_value)
+        """
+        index, key_hash = self._locate(key)
 
         # Check if key already exists and update
         current = self.buckets[index]
         while current:
-            if current.key == key:
+            if current.key_hash == key_hash and current.key == key:
                 old_value = current.value
                 current.value = value
-                return {
-                    "index": index,
-                    "collision": is_collision,
-                    "updated": True,
-                    "old_value": old_value,
-                }
+                return index, True, True, old_value  # the chain holds at least this key
             current = current.next
 
+        if self.max_load_factor is not None and self.count + 1 > self.max_load_factor * self.size:
+            self._start_rehash()
+            index, key_hash = self._locate(key)
+        is_collision = self.buckets[index] is not None
+
         # Insert new node at the beginning of the chain
-        new_node = HashNode(key, value)
+        new_node = HashNode(key, value, key_hash)
         new_node.next = self.buckets[index]
         self.buckets[index] = new_node
         self.count += 1
+        return index, is_collision, False, None
 
+    def insert(self, key: str, value: str) -> dict:
+        """Insert a key-value pair into the hash table"""
+        index, is_collision, updated, old_value = self._set(key, value)
+        if updated:
+            return {"index": index, "collision": is_collision, "updated": True, "old_value": old_value}
         return {"index": index, "collision": is_collision, "updated": False}
 
     def search(self, key: str) -> dict:
         """Search for a key in the hash table"""
-        index = self.hash(key)
+        index, key_hash = self._locate(key)
         current = self.buckets[index]
         steps = 0
 
         while current:
             steps += 1
-            if current.key == key:
+            if current.key_hash == key_hash and current.key == key:
                 return {"found": True, "value": current.value, "index": index, "steps": steps}
             current = current.next
 
@@ -92,12 +235,12 @@ class HashTable:
 
     def delete(self, key: str) -> bool:
         """Delete a key from the hash table"""
-        index = self.hash(key)
+        index, key_hash = self._locate(key)
         current = self.buckets[index]
         prev = None
 
         while current:
-            if current.key == key:
+            if current.key_hash == key_hash and current.key == key:
                 if prev:
                     prev.next = current.next
                 else:
@@ -109,8 +252,126 @@ class HashTable:
 
         return False
 
+    # ---- mapping interface: no diagnostic dicts ----
+
+    def _find_node(self, key: str):
+        index, key_hash = self._locate(key)
+        node = self.buckets[index]
+        while node and not (node.key_hash == key_hash and node.key == key):
+            node = node.next
+        return node
+
+    def __getitem__(self, key: str) -> str:
+        node = self._find_node(key)
+        if node is None:
+            raise KeyError(key)
+        return node.value
+
+    def get(self, key: str, default=None):
+        node = self._find_node(key)
+        return default if node is None else node.value
+
+    def __contains__(self, key: str) -> bool:
+        return self._find_node(key) is not None
+
+    def __setitem__(self, key: str, value: str):
+        self._set(key, value)
+
+    def __delitem__(self, key: str):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def __len__(self) -> int:
+        return self.count
+
+    def items(self) -> list:
+        """All (key, value) pairs, in bucket order (completes any rehash in progress)"""
+        self._finish_rehash()
+        pairs = []
+        for node in self.buckets:
+            while node:
+                pairs.append((node.key, node.value))
+                node = node.next
+        return pairs
+
+    def __iter__(self):
+        return iter([key for key, _ in self.items()])
+
+    def _hash_batch(self, keys: list) -> tuple:
+        """
+        Cube sums and current-table buckets for a whole batch, computed up
+        front. During a rehash every key's old bucket is moved first and
+        rehash_step buckets are drained per key, the same work as that many
+        single operations; the rest of the old table stays pending.
+        """
+        totals = list(map(self._cube_sum, keys))
+        if self._old_buckets is not None:
+            old_buckets, old_size = self._old_buckets, self._old_size
+            for total in totals:
+                old_index = self._index(total, old_size)
+                if old_buckets[old_index] is not None:
+                    self._migrate_bucket(old_index)
+            self._rehash_some(self.rehash_step * len(keys))
+        if self.capacity_policy == "pow2":
+            mask = self.size - 1
+            return totals, [total & mask for total in totals]
+        size = self.size
+        return totals, [total % size for total in totals]
+
+    def insert_many(self, pairs) -> int:
+        """
+        Insert or update a batch of (key, value) pairs; the last value wins
+        for repeated keys. The table grows at most once, up front, to fit
+        every key as if all were new; the batch is then hashed in one pass
+        and applied without per-key method calls. Returns the number of
+        new keys.
+        Cost: O(batch) plus, while a rehash is pending, the batch keys' old
+        buckets and rehash_step buckets per key; a growth started here is
+        drained incrementally like any other.
+        """
+        pairs = list(pairs)
+        if self.max_load_factor is not None and self.count + len(pairs) > self.max_load_factor * self.size:
+            # Never less than the usual growth, so repeated batches still
+            # resize geometrically
+            self._start_rehash(max(self._grown_size(), self._capacity_for(self.count + len(pairs))))
+        keys = [key for key, _ in pairs]
+        totals, indexes = self._hash_batch(keys)
+        buckets = self.buckets
+        added = 0
+        for (key, value), key_hash, index in zip(pairs, totals, indexes):
+            node = buckets[index]
+            while node and not (node.key_hash == key_hash and node.key == key):
+                node = node.next
+            if node:
+                node.value = value
+            else:
+                node = HashNode(key, value, key_hash)
+                node.next = buckets[index]
+                buckets[index] = node
+                added += 1
+        self.count += added
+        return added
+
+    def get_many(self, keys, default=None) -> list:
+        """
+        Values for a batch of keys (default where missing), in input order.
+        Cost: O(batch), with the same bounded rehash work as insert_many
+        """
+        keys = list(keys)
+        totals, indexes = self._hash_batch(keys)
+        buckets = self.buckets
+        results = []
+        append = results.append
+        for key, key_hash, index in zip(keys, totals, indexes):
+            node = buckets[index]
+            while node and not (node.key_hash == key_hash and node.key == key):
+                node = node.next
+            append(default if node is None else node.value)
+        return results
+
     def display(self):
-        """Display the hash table"""
+        """Display the hash table (completes any rehash in progress)"""
+        self._finish_rehash()
         print("\n" + "=" * 60)
         print("HASH TABLE CONTENTS")
         print("=" * 60)
@@ -126,7 +387,8 @@ class HashTable:
         print("=" * 60)
 
     def get_statistics(self) -> dict:
-        """Get hash table statistics"""
+        """Get hash table statistics (completes any rehash in progress)"""
+        self._finish_rehash()
         occupied = sum(1 for b in self.buckets if b is not None)
         collisions = sum(1 for b in self.buckets if b and b.next)
         max_chain = 0
@@ -145,7 +407,575 @@ class HashTable:
             "buckets_with_collisions": collisions,
             "load_factor": self.count / self.size,
             "max_chain_length": max_chain,
+            "resizes": self.resizes,
+        }
+
+
+class OpenAddressingHashTable:
+    """
+    Hash table with Robin Hood linear probing, stored in flat parallel
+    lists (hashes, keys, values) instead of chained HashNode objects.
+
+    A key sits at or after its home slot hash % size. On insert, a key
+    that has probed further than a slot's resident takes the slot and the
+    resident moves on, which keeps probe lengths short and even. That
+    ordering also lets a search for a missing key stop at the first
+    resident closer to home than the probe so far. Deletion shifts the
+    following displaced keys back by one, so no tombstones build up.
+    The same insert/search/delete/get_statistics API as HashTable, with
+    probe lengths in place of chain lengths. Growth to the next prime
+    (or power of two) is done all at once, reusing the cached hashes.
+    """
+
+    def __init__(self, size: int = 11, max_load_factor: float | None = 0.9,
+                 capacity_policy: str = "prime"):
+        if capacity_policy not in ("prime", "pow2"):
+            raise ValueError(f"unknown capacity policy: {capacity_policy!r}")
+        if capacity_policy == "pow2":
+            size = 1 << max(size - 1, 0).bit_length()
+        self.size = size
+        self.hashes = [0] * size
+        self.keys = [None] * size  # None marks an empty slot
+        self.values = [None] * size
+        self.count = 0
+        self.max_load_factor = max_load_factor
+        self.capacity_policy = capacity_policy
+        self.resizes = 0
+
+    def _home(self, total: int) -> int:
+        if self.capacity_policy == "pow2":
+            return total & (self.size - 1)
+        return total % self.size
+
+    def hash(self, key: str) -> int:
+        """Home slot: (Σ ASCII(char)³) mod size, as in HashTable"""
+        return self._home(_cube_sum(key))
+
+    def _find_slot(self, key: str, total: int) -> tuple:
+        """(slot holding key or None, slots examined)"""
+        hashes, keys, size = self.hashes, self.keys, self.size
+        mask = size - 1 if self.capacity_policy == "pow2" else None
+        index = self._home(total)
+        distance = 0
+        while True:
+            resident = keys[index]
+            if resident is None:
+                return None, distance + 1
+            resident_hash = hashes[index]
+            if resident_hash == total and resident == key:
+                return index, distance + 1
+            # A resident nearer its home than we are to ours means key would
+            # have displaced it on insert: key is absent
+            home = resident_hash & mask if mask is not None else resident_hash % size
+            if (index - home) % size < distance or distance == size:
+                return None, distance + 1
+            index = index + 1 if index + 1 < size else 0
+            distance += 1
+
+    def _place(self, total: int, key: str, value) -> int:
+        """Robin Hood insert of a key known to be absent; returns its slot"""
+        hashes, keys, values, size = self.hashes, self.keys, self.values, self.size
+        mask = size - 1 if self.capacity_policy == "pow2" else None
+        index = self._home(total)
+        distance = 0
+        placed = None
+        while keys[index] is not None:
+            resident_hash = hashes[index]
+            home = resident_hash & mask if mask is not None else resident_hash % size
+            resident_distance = (index - home) % size
+            if resident_distance < distance:
+                # Take from the rich: swap and carry the resident onward
+                hashes[index], total = total, hashes[index]
+                keys[index], key = key, keys[index]
+                values[index], value = value, values[index]
+                distance = resident_distance
+                if placed is None:
+                    placed = index
+            index = index + 1 if index + 1 < size else 0
+            distance += 1
+        hashes[index], keys[index], values[index] = total, key, value
+        return index if placed is None else placed
+
+    def _grow(self):
+        entries = [(h, k, v) for h, k, v in zip(self.hashes, self.keys, self.values) if k is not None]
+        if self.capacity_policy == "pow2":
+            self.size *= 2
+        else:
+            self.size = _next_prime(self.size * 2 + 1)
+        self.hashes = [0] * self.size
+        self.keys = [None] * self.size
+        self.values = [None] * self.size
+        for total, key, value in entries:
+            self._place(total, key, value)
+        self.resizes += 1
+
+    def insert(self, key: str, value: str) -> dict:
+        """Insert a key-value pair into the hash table"""
+        total = _cube_sum(key)
+        index, _ = self._find_slot(key, total)
+        if index is not None:
+            old_value = self.values[index]
+            self.values[index] = value
+            return {"index": index, "collision": True, "updated": True, "old_value": old_value}
+
+        if self.max_load_factor is not None and self.count + 1 > self.max_load_factor * self.size:
+            self._grow()
+        elif self.count == self.size:
+            raise RuntimeError("hash table is full (max_load_factor=None)")
+        is_collision = self.keys[self._home(total)] is not None
+        index = self._place(total, key, value)
+        self.count += 1
+        return {"index": index, "collision": is_collision, "updated": False}
+
+    def search(self, key: str) -> dict:
+        """Search for a key; steps counts the slots probed"""
+        total = _cube_sum(key)
+        index, steps = self._find_slot(key, total)
+        if index is None:
+            return {"found": False, "value": None, "index": self._home(total), "steps": steps}
+        return {"found": True, "value": self.values[index], "index": index, "steps": steps}
+
+    def delete(self, key: str) -> bool:
+        """Delete a key, shifting the displaced keys after it back one slot"""
+        index, _ = self._find_slot(key, _cube_sum(key))
+        if index is None:
+            return False
+        hashes, keys, values, size = self.hashes, self.keys, self.values, self.size
+        following = index + 1 if index + 1 < size else 0
+        while keys[following] is not None and (following - self._home(hashes[following])) % size:
+            hashes[index], keys[index], values[index] = hashes[following], keys[following], values[following]
+            index = following
+            following = index + 1 if index + 1 < size else 0
+        hashes[index], keys[index], values[index] = 0, None, None
+        self.count -= 1
+        return True
+
+    def display(self):
+        """Display the occupied slots with their distance from home"""
+        print("\n" + "=" * 60)
+        print("HASH TABLE CONTENTS (open addressing)")
+        print("=" * 60)
+        for i, key in enumerate(self.keys):
+            if key is None:
+                print(f"[{i:2d}] empty")
+            else:
+                distance = (i - self._home(self.hashes[i])) % self.size
+                marker = f" [+{distance}]" if distance else ""
+                print(f'[{i:2d}] "{key}": "{self.values[i]}"{marker}')
+        print("=" * 60)
+
+    def get_statistics(self) -> dict:
+        """Get hash table statistics; probe length = slots a successful search examines"""
+        probes = [(i - self._home(self.hashes[i])) % self.size + 1
+                  for i, key in enumerate(self.keys) if key is not None]
+        return {
+            "size": self.size,
+            "count": self.count,
+            "occupied_buckets": self.count,
+            "displaced_keys": sum(1 for p in probes if p > 1),
+            "load_factor": self.count / self.size,
+            "mean_probe_length": sum(probes) / len(probes) if probes else 0.0,
+            "max_probe_length": max(probes, default=0),
+            "resizes": self.resizes,
+        }
+
+
+class ConcurrentHashTable:
+    """
+    Thread-safe hash table with lock striping and lock-free reads.
+
+    Each bucket holds an immutable tuple of (key_hash, key, value)
+    entries. A writer builds a new tuple and stores it in the bucket slot
+    under the lock of its stripe (bucket index % stripes), so writers to
+    different stripes never wait for each other. A reader takes no lock:
+    it reads the published (buckets, size) pair and then one bucket
+    tuple, which no one mutates. Growth takes every stripe lock, builds a
+    new bucket list and publishes it in one assignment. Writers that
+    locked a stripe of the old table notice the swap and retry.
+
+    count is kept per stripe under that stripe's lock and recomputed
+    while all locks are held during a resize. len() sums the stripe
+    counters without locking.
+    """
+
+    def __init__(self, size: int = 11, max_load_factor: float | None = 0.75, stripes: int = 16):
+        self.max_load_factor = max_load_factor
+        self._locks = [threading.Lock() for _ in range(stripes)]
+        self._counts = [0] * stripes
+        self._table = ([()] * size, size)  # replaced as a whole on resize
+        self.resizes = 0
+
+    @property
+    def size(self) -> int:
+        return self._table[1]
+
+    def __len__(self) -> int:
+        return sum(self._counts)
+
+    def _entry(self, key: str):
+        """(key_hash, key, value) for key from the current table, or None. Lock-free"""
+        buckets, size = self._table
+        total = _cube_sum(key)
+        for entry in buckets[total % size]:
+            if entry[0] == total and entry[1] == key:
+                return entry
+        return None
+
+    def __getitem__(self, key: str) -> str:
+        entry = self._entry(key)
+        if entry is None:
+            raise KeyError(key)
+        return entry[2]
+
+    def get(self, key: str, default=None):
+        entry = self._entry(key)
+        return default if entry is None else entry[2]
+
+    def __contains__(self, key: str) -> bool:
+        return self._entry(key) is not None
+
+    def _lock_bucket(self, total: int) -> tuple:
+        """Lock the stripe owning total's bucket in the current table: (buckets, index, stripe)"""
+        while True:
+            table = self._table
+            buckets, size = table
+            index = total % size
+            stripe = index % len(self._locks)
+            self._locks[stripe].acquire()
+            if self._table is table:
+                return buckets, index, stripe
+            # Resized while we waited: the bucket moved
+            self._locks[stripe].release()
+
+    def __setitem__(self, key: str, value: str):
+        self.insert(key, value)
+
+    def insert(self, key: str, value: str) -> bool:
+        """Insert or update key; True if it was new"""
+        total = _cube_sum(key)
+        buckets, index, stripe = self._lock_bucket(total)
+        try:
+            chain = buckets[index]
+            for position, entry in enumerate(chain):
+                if entry[0] == total and entry[1] == key:
+                    buckets[index] = chain[:position] + ((total, key, value),) + chain[position + 1:]
+                    return False
+            buckets[index] = chain + ((total, key, value),)
+            self._counts[stripe] += 1
+            # Other stripes' counters are read unlocked: a slightly stale
+            # total only shifts the resize by a few inserts
+            grow = self.max_load_factor is not None and sum(self._counts) > self.max_load_factor * len(buckets)
+        finally:
+            self._locks[stripe].release()
+        if grow:
+            self._resize(buckets)
+        return True
+
+    def delete(self, key: str) -> bool:
+        """Delete key; False if it was not stored"""
+        total = _cube_sum(key)
+        buckets, index, stripe = self._lock_bucket(total)
+        try:
+            chain = buckets[index]
+            for position, entry in enumerate(chain):
+                if entry[0] == total and entry[1] == key:
+                    buckets[index] = chain[:position] + chain[position + 1:]
+                    self._counts[stripe] -= 1
+                    return True
+            return False
+        finally:
+            self._locks[stripe].release()
+
+    def __delitem__(self, key: str):
+        if not self.delete(key):
+            raise KeyError(key)
+
+    def _resize(self, seen_buckets: list):
+        """Grow to the next prime >= 2 * size + 1 unless another writer already did"""
+        for lock in self._locks:
+            lock.acquire()
+        try:
+            buckets, size = self._table
+            if buckets is not seen_buckets:
+                return
+            new_size = _next_prime(size * 2 + 1)
+            grouped = [[] for _ in range(new_size)]
+            for chain in buckets:
+                for entry in chain:
+                    grouped[entry[0] % new_size].append(entry)
+            new_buckets = [tuple(chain) for chain in grouped]
+            stripes = len(self._locks)
+            counts = [0] * stripes
+            for index, chain in enumerate(new_buckets):
+                counts[index % stripes] += len(chain)
+            self._counts[:] = counts
+            self._table = (new_buckets, new_size)
+            self.resizes += 1
+        finally:
+            for lock in self._locks:
+                lock.release()
+
+    def items(self) -> list:
+        """(key, value) pairs of one published table; writes racing with the scan may or may not appear"""
+        return [(key, value) for chain in self._table[0] for _, key, value in chain]
+
+    def get_statistics(self) -> dict:
+        """Get hash table statistics from the current table, without locking"""
+        buckets, size = self._table
+        lengths = [len(chain) for chain in buckets]
+        count = sum(self._counts)
+        return {
+            "size": size,
+            "count": count,
+            "occupied_buckets": sum(1 for length in lengths if length),
+            "buckets_with_collisions": sum(1 for length in lengths if length > 1),
+            "load_factor": count / size,
+            "max_chain_length": max(lengths, default=0),
+            "resizes": self.resizes,
+            "stripes": len(self._locks),
+        }
+
+
+def _random_keys(n: int, seed: int = 42) -> list:
+    """n distinct random alphanumeric keys of 6-16 characters"""
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits
+    keys = set()
+    while len(keys) < n:
+        keys.add("".join(rng.choices(alphabet, k=rng.randint(6, 16))))
+    return list(keys)
+
+
+def benchmark_resize_latency(n: int = 1_000_000, seed: int = 42) -> dict:
+    """
+    Per-insert latency percentiles while growing from 11 buckets:
+    incremental vs stop-the-world rehash. The cyclic GC is paused while
+    timing; its collections over a million nodes would otherwise swamp
+    the resize pauses being measured.
+    """
+    keys = _random_keys(n, seed)
+    cases = [
+        ("incremental, prime", {}),
+        ("incremental, pow2", {"capacity_policy": "pow2"}),
+        ("stop-the-world, prime", {"rehash_step": None}),
+    ]
+    results = {}
+    print(f"\nInsert latency during growth, {n:,} keys (microseconds)")
+    print(f"  {'mode':<22} {'p50':>7} {'p99':>7} {'p99.9':>8} {'max':>10} {'total s':>8}")
+    for name, options in cases:
+        ht = HashTable(11, **options)
+        latencies = [0] * n
+        clock = time.perf_counter_ns
+        gc.disable()
+        try:
+            for i, key in enumerate(keys):
+                start = clock()
+                ht.insert(key, key)
+                latencies[i] = clock() - start
+        finally:
+            gc.enable()
+        latencies.sort()
+        row = {
+            "p50": latencies[n // 2] / 1000,
+            "p99": latencies[int(n * 0.99)] / 1000,
+            "p99.9": latencies[int(n * 0.999)] / 1000,
+            "max": latencies[-1] / 1000,
+            "total": sum(latencies) / 1e9,
+            "resizes": ht.resizes,
         }
+        results[name] = row
+        print(f"  {name:<22} {row['p50']:7.1f} {row['p99']:7.1f} {row['p99.9']:8.1f} "
+              f"{row['max']:10.0f} {row['total']:8.2f}")
+    return results
+
+
+def _cube_sum_loop(key: str) -> int:
+    """The original per-character loop, kept as the benchmark baseline"""
+    total = 0
+    for char in key:
+        ascii_code = ord(char)
+        total += ascii_code ** 3
+    return total
+
+
+def benchmark_hash_throughput(n: int = 1_000_000, seed: int = 42) -> dict:
+    """Keys/s for the bare hash and for insert + search, per-char loop vs table lookup"""
+    keys = _random_keys(n, seed)
+
+    results = {}
+    print(f"\nHash throughput, {n:,} keys")
+    for name, cube_sum in (("per-char loop", _cube_sum_loop), ("cube table", _cube_sum)):
+        start = time.perf_counter()
+        for key in keys:
+            cube_sum(key)
+        hashing = time.perf_counter() - start
+
+        ht = HashTable(11, cube_sum=cube_sum)
+        start = time.perf_counter()
+        for key in keys:
+            ht.insert(key, key)
+        for key in keys:
+            ht.search(key)
+        operations = time.perf_counter() - start
+
+        results[name] = {"hash_per_s": n / hashing, "ops_per_s": 2 * n / operations}
+        print(f"  {name:<14} hash {n / hashing:12,.0f} keys/s   insert+search {2 * n / operations:10,.0f} ops/s")
+    return results
+
+
+def benchmark_open_addressing(n: int = 200_000, load_factors=(0.5, 0.6, 0.7, 0.8, 0.9), seed: int = 42) -> dict:
+    """
+    Chaining vs Robin Hood open addressing at fixed load factors: each
+    table is sized so n keys give the target load and growth is disabled.
+    Reports insert, hit, miss and delete throughput plus probe lengths.
+    """
+    keys = _random_keys(2 * n, seed)
+    present, absent = keys[:n], keys[n:]
+    results = {}
+    print(f"\nChaining vs open addressing, {n:,} keys (ops/s)")
+    print(f"  {'load':>4} {'engine':<12} {'B/key':>6} {'insert':>10} {'hit':>10} {'miss':>10} {'delete':>10}  probes/chain")
+    for load in load_factors:
+        size = _next_prime(int(n / load))
+        for name, factory in (("chaining", HashTable), ("robin hood", OpenAddressingHashTable)):
+            # Table storage in a separate untimed build: the key strings
+            # already exist, so this counts slots, nodes and cached hashes
+            tracemalloc.start()
+            ht = factory(size, max_load_factor=None)
+            for key in present:
+                ht.insert(key, key)
+            memory = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+
+            ht = factory(size, max_load_factor=None)
+            timings = {}
+            for phase, operation, batch in (("insert", lambda k: ht.insert(k, k), present),
+                                            ("hit", ht.search, present),
+                                            ("miss", ht.search, absent),
+                                            ("delete", ht.delete, present[: n // 2])):
+                if phase == "delete":
+                    stats = ht.get_statistics()
+                start = time.perf_counter()
+                for key in batch:
+                    operation(key)
+                timings[phase] = len(batch) / (time.perf_counter() - start)
+            if name == "chaining":
+                shape = f"max chain {stats['max_chain_length']}"
+            else:
+                shape = f"mean {stats['mean_probe_length']:.2f}, max {stats['max_probe_length']}"
+            results[(load, name)] = {**timings, **stats, "bytes_per_key": memory / n}
+            print(f"  {load:4.1f} {name:<12} {memory / n:6.0f} {timings['insert']:10,.0f} {timings['hit']:10,.0f} "
+                  f"{timings['miss']:10,.0f} {timings['delete']:10,.0f}  {shape}")
+    return results
+
+
+def benchmark_mapping_api(n: int = 1_000_000, seed: int = 42) -> dict:
+    """Keys/s for writes and reads: diagnostic insert/search vs mapping interface vs batch calls (dict for reference)"""
+    keys = _random_keys(n, seed)
+    pairs = [(key, key) for key in keys]
+
+    def write_insert():
+        ht = HashTable()
+        for key in keys:
+            ht.insert(key, key)
+        return ht
+
+    def write_setitem():
+        ht = HashTable()
+        for key in keys:
+            ht[key] = key
+        return ht
+
+    def write_many():
+        ht = HashTable()
+        ht.insert_many(pairs)
+        return ht
+
+    def write_dict():
+        return dict(pairs)
+
+    results = {}
+    print(f"\nMapping API benchmark, {n:,} keys (keys/s)")
+    for name, write, read in (
+        ("insert() / search()", write_insert, lambda ht: [ht.search(key) for key in keys]),
+        ("ht[k] = v / ht[k]", write_setitem, lambda ht: [ht[key] for key in keys]),
+        ("insert_many / get_many", write_many, lambda ht: ht.get_many(keys)),
+        ("built-in dict", write_dict, lambda d: [d[key] for key in keys]),
+    ):
+        start = time.perf_counter()
+        table = write()
+        writing = time.perf_counter() - start
+        start = time.perf_counter()
+        read(table)
+        reading = time.perf_counter() - start
+        results[name] = {"writes_per_s": n / writing, "reads_per_s": n / reading}
+        print(f"  {name:<24} write {n / writing:12,.0f}   read {n / reading:12,.0f}")
+        del table
+    return results
+
+
+def benchmark_concurrent(thread_counts=(1, 2, 4, 8, 16, 32), operations: int = 400_000,
+                         keys: int = 100_000, seed: int = 42) -> dict:
+    """
+    Mixed 70% search / 20% insert / 10% delete from 1..32 threads, the
+    same total work split between them. Compares ConcurrentHashTable with
+    a HashTable behind one global lock.
+    """
+    key_pool = _random_keys(keys, seed)
+
+    def striped_factory():
+        table = ConcurrentHashTable()
+        return table, table.get, table.insert, table.delete
+
+    def locked_factory():
+        table = HashTable()
+        lock = threading.Lock()
+
+        def get(key):
+            with lock:
+                return table.get(key)
+
+        def insert(key, value):
+            with lock:
+                table[key] = value
+
+        def delete(key):
+            with lock:
+                return table.delete(key)
+        return table, get, insert, delete
+
+    results = {}
+    print(f"\nConcurrent mixed workload: {operations:,} operations over {keys:,} keys (ops/s)")
+    print(f"  {'threads':>7} {'lock striping':>15} {'global lock':>15}")
+    for threads in thread_counts:
+        row = {}
+        for name, factory in (("lock striping", striped_factory), ("global lock", locked_factory)):
+            table, get, insert, delete = factory()
+            for key in key_pool[::2]:
+                insert(key, key)
+
+            def worker(slot, count):
+                rng = random.Random(seed + slot)
+                for _ in range(count):
+                    key = key_pool[rng.randrange(keys)]
+                    op = rng.random()
+                    if op < 0.7:
+                        get(key)
+                    elif op < 0.9:
+                        insert(key, key)
+                    else:
+                        delete(key)
+
+            workers = [threading.Thread(target=worker, args=(slot, operations // threads))
+                       for slot in range(threads)]
+            start = time.perf_counter()
+            for thread in workers:
+                thread.start()
+            for thread in workers:
+                thread.join()
+            row[name] = operations / (time.perf_counter() - start)
+        results[threads] = row
+        print(f"  {threads:>7} {row['lock striping']:15,.0f} {row['global lock']:15,.0f}")
+    return results
 
 
 def demonstrate_hash_function():
@@ -201,9 +1031,12 @@ def main():
     ]
 
     for key, value in data:
+        size_before = ht.size
         result = ht.insert(key, value)
         collision_msg = " (COLLISION!)" if result["collision"] else ""
         print(f"Insert '{key}' -> bucket [{result['index']}]{collision_msg}")
+        if ht.size != size_before:
+            print(f"  Load factor passed {ht.max_load_factor}: table grew {size_before} -> {ht.size} buckets")
 
     # Display table
     ht.display()
@@ -233,6 +1066,17 @@ def main():
         else:
             print(f"Search '{key}': NOT FOUND (checked bucket [{result['index']}])")
 
+    # Mapping interface: same table, no diagnostic dicts
+    print("\n" + "=" * 60)
+    print("MAPPING INTERFACE")
+    print("=" * 60)
+    ht["papaya"] = "A soft orange fruit"
+    print(f"ht['kiwi'] -> {ht['kiwi']!r}")
+    print(f"'watermelon' in ht -> {'watermelon' in ht}, ht.get('watermelon', '-') -> {ht.get('watermelon', '-')!r}")
+    print(f"get_many(['fig', 'papaya', 'plum']) -> {ht.get_many(['fig', 'papaya', 'plum'])}")
+    del ht["papaya"]
+    print(f"len(ht) after del ht['papaya'] -> {len(ht)}")
+
     # Delete operations
     print("\n" + "=" * 60)
     print("DELETE OPERATIONS")
@@ -256,6 +1100,40 @@ def main():
         else:
             print(f"  {key}: {value}")
 
+    # Shared between threads
+    print("\n" + "=" * 60)
+    print("CONCURRENT HASH TABLE (4 WRITER THREADS)")
+    print("=" * 60)
+    shared = ConcurrentHashTable(11, stripes=4)
+
+    def insert_part(part):
+        for key, value in part:
+            shared.insert(key, value)
+
+    writers = [threading.Thread(target=insert_part, args=(data[i::4],)) for i in range(4)]
+    for thread in writers:
+        thread.start()
+    for thread in writers:
+        thread.join()
+    print(f"  {len(shared)} keys after concurrent inserts, shared['mango'] -> {shared['mango']!r}")
+    print(f"  size {shared.size}, resizes {shared.resizes}, stripes {shared.get_statistics()['stripes']}")
+
+    # Same data, open addressing
+    print("\n" + "=" * 60)
+    print("OPEN ADDRESSING (ROBIN HOOD PROBING)")
+    print("=" * 60)
+    oa = OpenAddressingHashTable(11)
+    for key, value in data:
+        oa.insert(key, value)
+    for key in delete_keys:
+        oa.delete(key)
+    oa.display()
+    for key, value in oa.get_statistics().items():
+        if isinstance(value, float):
+            print(f"  {key}: {value:.2f}")
+        else:
+            print(f"  {key}: {value}")
+
 
 if __name__ == "__main__":
     main()